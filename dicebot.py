@@ -3,7 +3,11 @@ import random
 import re
 import math
 import html
+import io
 import asyncio
+import bisect
+import itertools
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple, List, Dict
 
@@ -19,46 +23,66 @@ from telegram.ext import (
     filters,
 )
 
+_RNG = random.Random()
+
+def _choice(pool: Tuple[str, ...], _randbelow=_RNG._randbelow) -> str:
+    return pool[_randbelow(len(pool))]
+
+def _roll_die(sides: int, _randbelow=_RNG._randbelow) -> int:
+    return _randbelow(sides) + 1
+
+_DIE_FACES: Dict[int, range] = {s: range(1, s + 1) for s in (2, 3, 4, 6, 8, 10, 12, 20, 100)}
+
+def _roll_dice(count: int, sides: int, _choices=_RNG.choices, _faces=_DIE_FACES) -> List[int]:
+    return _choices(_faces.get(sides) or range(1, sides + 1), k=count)
+
+def _range_table_bounds(table: List[Tuple[int, int, object]]) -> Tuple[Tuple[int, ...], Tuple[object, ...]]:
+    # Tabellen laufen lückenlos von 1 bis 100, daher reichen die Obergrenzen für bisect
+    return tuple(b for _a, b, _payload in table), tuple(payload for _a, _b, payload in table)
+
+def _pick_range_bounds(bounds: Tuple[Tuple[int, ...], Tuple[object, ...]], roll_: int):
+    uppers, payloads = bounds
+    idx = bisect.bisect_left(uppers, roll_)
+    if idx < len(payloads):
+        return payloads[idx]
+    return None
+
 # -----------------------
 # DICE ROLL SYSTEM
 # -----------------------
 
 _ROLL_ALLOWED = re.compile(r"^[0-9dDwW+\-\s]+$")
-_ROLL_TERM = re.compile(r"([+\-]?)(\d+[dw]\d+|\d+)", re.IGNORECASE)
-_ROLL_DICE = re.compile(r"^(\d+)[dw](\d+)$", re.IGNORECASE)
+_ROLL_TERM = re.compile(r"([+\-]?)(\d+)(?:[dw](\d+))?", re.IGNORECASE)
+_ROLL_EXPR = re.compile(r"[+\-]?\d+(?:[dw]\d+)?(?:[+\-]\d+(?:[dw]\d+)?)*", re.IGNORECASE | re.ASCII)
 _ROLL_CMD_PREFIX = re.compile(r"^/roll(?:@\w+)?\s*", re.IGNORECASE)
 _ROLL_NOTE_SPLIT = re.compile(r"^(.*?)(?:\s+#notiz:\s*(.+))?$", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_INT_ARG = re.compile(r"[+-]?\d+")
 
 def parse_roll_expression(expr: str) -> Tuple[str, int, List[str]]:
     raw = (expr or "").strip()
     if not raw:
         raise ValueError("Leerer Ausdruck")
 
-    if not _ROLL_ALLOWED.match(raw):
-        raise ValueError("Ungültige Zeichen im Ausdruck")
-
-    compact = re.sub(r"\s+", "", raw)
-    terms = list(_ROLL_TERM.finditer(compact))
-    if not terms:
-        raise ValueError("Kein gültiger Ausdruck gefunden")
-
-    rebuilt = "".join(t.group(0) for t in terms)
-    if rebuilt != compact:
+    compact = _WHITESPACE.sub("", raw)
+    if not _ROLL_EXPR.fullmatch(compact):
+        if not _ROLL_ALLOWED.match(raw):
+            raise ValueError("Ungültige Zeichen im Ausdruck")
+        if not _ROLL_TERM.search(compact):
+            raise ValueError("Kein gültiger Ausdruck gefunden")
         raise ValueError("Ungültiges Format. Nutze z.B. 1d20+2d6+3")
 
     total = 0
     details: List[str] = []
     total_dice_rolled = 0
 
-    for t in terms:
-        sign_txt = t.group(1)
+    for t in _ROLL_TERM.finditer(compact):
+        sign_txt, num_txt, sides_txt = t.groups()
         sign = -1 if sign_txt == "-" else 1
-        token = t.group(2)
 
-        m_dice = _ROLL_DICE.match(token)
-        if m_dice:
-            count = int(m_dice.group(1))
-            sides = int(m_dice.group(2))
+        if sides_txt:
+            count = int(num_txt)
+            sides = int(sides_txt)
 
             if count < 1 or count > 100:
                 raise ValueError("Maximal 100 Würfel pro Term")
@@ -69,19 +93,19 @@ def parse_roll_expression(expr: str) -> Tuple[str, int, List[str]]:
             if total_dice_rolled > 200:
                 raise ValueError("Zu viele Würfel insgesamt. Maximal 200 pro Ausdruck")
 
-            rolls = [random.randint(1, sides) for _ in range(count)]
-            part_sum = sum(rolls) * sign
-            total += part_sum
+            rolls = _roll_dice(count, sides)
+            rolls_sum = sum(rolls)
+            total += rolls_sum * sign
 
             sgn = "-" if sign < 0 else "+"
             dice_name = f"{count}d{sides}"
             if count == 1:
                 details.append(f"{sgn}{dice_name}: {rolls[0]}")
             else:
-                details.append(f"{sgn}{dice_name}: {', '.join(map(str, rolls))} (Summe {sum(rolls)})")
+                details.append(f"{sgn}{dice_name}: {', '.join(map(str, rolls))} (Summe {rolls_sum})")
             continue
 
-        val = int(token) * sign
+        val = int(num_txt) * sign
         total += val
         sgn = "-" if val < 0 else "+"
         details.append(f"{sgn}{abs(val)} Mod")
@@ -145,7 +169,7 @@ async def roll(update: Update, context: ContextTypes.DEFAULT_TYPE):
         )
         return
 
-    results: List[str] = []
+    parts: List[str] = []
 
     for idx, (expr, note) in enumerate(jobs, start=1):
         try:
@@ -162,20 +186,19 @@ async def roll(update: Update, context: ContextTypes.DEFAULT_TYPE):
             )
             return
 
-        block_lines = []
+        if idx > 1:
+            parts.append("")
         if len(jobs) > 1:
-            block_lines.append(f"{idx}.")
+            parts.append(f"{idx}.")
         if note:
-            block_lines.append(f"Notiz: {note}")
-        block_lines.append(f"🎲 {normalized}")
-        block_lines.append("Details:")
-        block_lines.extend(details)
-        block_lines.append("")
-        block_lines.append(f"Summe: {total}")
-        results.append("\n".join(block_lines))
-
-    msg = "\n\n".join(results)
-    await update.message.reply_text(msg)
+            parts.append(f"Notiz: {note}")
+        parts.append(f"🎲 {normalized}")
+        parts.append("Details:")
+        parts.extend(details)
+        parts.append("")
+        parts.append(f"Summe: {total}")
+
+    await update.message.reply_text("\n".join(parts))
 
 # -----------------------
 # ORACLE SYSTEM
@@ -211,7 +234,7 @@ BASE_CHANCE = {
     "has_to_be": 99,
 }
 
-EVENT_FOCUS = [
+EVENT_FOCUS = (
     "Fernere Begegnung",
     "Umgebungsereignis",
     "NSC Aktion",
@@ -220,44 +243,61 @@ EVENT_FOCUS = [
     "Faden bewegt sich",
     "Neuer Faden",
     "Hinweis oder Zeichen",
-]
+)
 
-ACTION_WORDS = [
+ACTION_WORDS = (
     "Enthüllen", "Verbergen", "Warnen", "Vereinen", "Zerbrechen", "Locken",
     "Verfolgen", "Täuschen", "Retten", "Opfern", "Entkommen", "Erinnern",
     "Wachsen", "Verhandeln", "Entfachen", "Erstarren",
-]
+)
 
-SUBJECT_WORDS = [
+SUBJECT_WORDS = (
     "Schlüssel", "Tor", "Pfad", "Schatten", "Spiegel", "Schwur", "Krone",
     "Echo", "Nebel", "Feuer", "Fluss", "Ruine", "Fremder", "Tier", "Grenze",
     "Blut",
-]
+)
 
 def clamp(n: int, lo: int, hi: int) -> int:
     return max(lo, min(hi, n))
 
-def oracle_outcome(odds_key: str, chaos_rank: int) -> dict:
+ORACLE_RESULTS = ("Nein", "Ja", "Außergewöhnlich Ja", "Außergewöhnlich Nein")
+
+def _oracle_entry(odds_key: str, chaos_rank: int) -> Tuple[int, int, int, bytes]:
     base = BASE_CHANCE[odds_key]
     adjust = (chaos_rank - 5) * 5
     chance = clamp(base + adjust, 0, 100)
 
-    roll_ = random.randint(1, 100)
-
     ex_yes = 0 if chance == 0 else max(1, chance // 5)
 
     fail_size = 100 - chance
     ex_no_size = 0 if fail_size == 0 else int(math.ceil(fail_size / 5))
     ex_no_start = 101 if ex_no_size == 0 else 101 - ex_no_size
 
-    if chance > 0 and roll_ <= ex_yes:
-        result = "Außergewöhnlich Ja"
-    elif roll_ <= chance:
-        result = "Ja"
-    elif chance < 100 and roll_ >= ex_no_start:
-        result = "Außergewöhnlich Nein"
-    else:
-        result = "Nein"
+    # Index = W100 Wurf, Wert = Index in ORACLE_RESULTS
+    results = bytearray(101)
+    for roll_ in range(1, 101):
+        if chance > 0 and roll_ <= ex_yes:
+            results[roll_] = 2
+        elif roll_ <= chance:
+            results[roll_] = 1
+        elif chance < 100 and roll_ >= ex_no_start:
+            results[roll_] = 3
+
+    return chance, ex_yes, ex_no_start, bytes(results)
+
+_ORACLE_TABLE = {
+    (odds_key, chaos_rank): _oracle_entry(odds_key, chaos_rank)
+    for odds_key in BASE_CHANCE
+    for chaos_rank in range(1, 10)
+}
+
+def oracle_outcome(odds_key: str, chaos_rank: int) -> dict:
+    entry = _ORACLE_TABLE.get((odds_key, chaos_rank))
+    if entry is None:
+        entry = _oracle_entry(odds_key, chaos_rank)
+    chance, ex_yes, ex_no_start, results = entry
+
+    roll_ = _roll_die(100)
 
     doubles = (roll_ % 11 == 0)
     random_event = bool(doubles and roll_ <= chaos_rank)
@@ -267,7 +307,7 @@ def oracle_outcome(odds_key: str, chaos_rank: int) -> dict:
         "chance": chance,
         "ex_yes": ex_yes,
         "ex_no_start": ex_no_start,
-        "result": result,
+        "result": ORACLE_RESULTS[results[roll_]],
         "random_event": random_event,
     }
 
@@ -295,6 +335,9 @@ def build_chaos_keyboard():
         rows.append(row)
     return InlineKeyboardMarkup(rows)
 
+ODDS_KEYBOARD = build_odds_keyboard()
+CHAOS_KEYBOARD = build_chaos_keyboard()
+
 async def rolloracle_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data.pop("oracle_question", None)
     context.user_data.pop("oracle_odds", None)
@@ -302,7 +345,7 @@ async def rolloracle_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     if context.args:
         context.user_data["oracle_question"] = " ".join(context.args).strip()
-        await update.message.reply_text("🔮 Wie sind die Chancen?", reply_markup=build_odds_keyboard())
+        await update.message.reply_text("🔮 Wie sind die Chancen?", reply_markup=ODDS_KEYBOARD)
         return ORACLE_ODDS
 
     await update.message.reply_text("🔮 Was ist deine Ja Nein Frage? Schreib sie als Antwort 🙂")
@@ -311,7 +354,7 @@ async def rolloracle_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def rolloracle_question(update: Update, context: ContextTypes.DEFAULT_TYPE):
     text = (update.message.text or "").strip()
     context.user_data["oracle_question"] = text if text else "Ohne konkrete Frage"
-    await update.message.reply_text("Wie sind die Chancen?", reply_markup=build_odds_keyboard())
+    await update.message.reply_text("Wie sind die Chancen?", reply_markup=ODDS_KEYBOARD)
     return ORACLE_ODDS
 
 async def rolloracle_pick_odds(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -321,7 +364,7 @@ async def rolloracle_pick_odds(update: Update, context: ContextTypes.DEFAULT_TYP
     data = query.data.split(":", 1)[1]
     context.user_data["oracle_odds"] = data
 
-    await query.edit_message_text("Chaos Rang auswählen, 1 bis 9", reply_markup=build_chaos_keyboard())
+    await query.edit_message_text("Chaos Rang auswählen, 1 bis 9", reply_markup=CHAOS_KEYBOARD)
     return ORACLE_CHAOS
 
 async def rolloracle_pick_chaos(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -347,9 +390,9 @@ async def rolloracle_pick_chaos(update: Update, context: ContextTypes.DEFAULT_TY
     )
 
     if result["random_event"]:
-        focus = random.choice(EVENT_FOCUS)
-        w1 = random.choice(ACTION_WORDS)
-        w2 = random.choice(SUBJECT_WORDS)
+        focus = _choice(EVENT_FOCUS)
+        w1 = _choice(ACTION_WORDS)
+        w2 = _choice(SUBJECT_WORDS)
         msg += (
             f"\n\n✨ Zufallsereignis ausgelöst\n"
             f"Fokus: {focus}\n"
@@ -370,19 +413,23 @@ async def rolloracle_cancel(update: Update, context: ContextTypes.DEFAULT_TYPE):
 SURFACE_BIOMES = ["Arktis", "Küste", "Wüste", "Wald", "Grasland", "Hügel", "Berg", "Sumpf"]
 SPECIAL_BIOMES = ["Unterreich", "Wasser", "Stadt/Dorf"]
 ALL_BIOMES = SURFACE_BIOMES + SPECIAL_BIOMES
+UNKNOWN_BIOM_MSG = "Unbekanntes Biom. Erlaubt: " + ", ".join(ALL_BIOMES)
+
+# Casefold-Eingabe -> Biomname, inklusive Schreibweisen für Stadt/Dorf
+_BIOM_BY_FOLDED: Dict[str, str] = {b.casefold(): b for b in ALL_BIOMES}
+_BIOM_BY_FOLDED.update({
+    "stadt": "Stadt/Dorf",
+    "dorf": "Stadt/Dorf",
+    "stadt dorf": "Stadt/Dorf",
+    "stadt/dorf": "Stadt/Dorf",
+    "stadt\\dorf": "Stadt/Dorf",
+})
 
 def normalize_biom(text: str) -> Optional[str]:
-    t = (text or "").strip().lower()
+    t = (text or "").strip().casefold()
     if not t:
         return None
-
-    if t in {"stadt", "dorf", "stadt dorf", "stadt/dorf", "stadt\\dorf"}:
-        return "Stadt/Dorf"
-
-    for b in ALL_BIOMES:
-        if t == b.lower():
-            return b
-    return None
+    return _BIOM_BY_FOLDED.get(t)
 
 def build_biom_keyboard() -> InlineKeyboardMarkup:
     rows = []
@@ -397,9 +444,14 @@ def build_biom_keyboard() -> InlineKeyboardMarkup:
         rows.append(row)
     return InlineKeyboardMarkup(rows)
 
-def roll_biom(current_biom: str) -> Tuple[str, str, Optional[str]]:
-    if current_biom not in ALL_BIOMES:
-        raise ValueError(f"Unbekanntes Biom: {current_biom}")
+BIOM_KEYBOARD = build_biom_keyboard()
+
+_BIOM_ROLL_TABLES: Dict[str, Tuple[List[float], List[Tuple[str, str, Optional[str]]]]] = {}
+
+def _biom_roll_table(current_biom: str) -> Tuple[List[float], List[Tuple[str, str, Optional[str]]]]:
+    table = _BIOM_ROLL_TABLES.get(current_biom)
+    if table is not None:
+        return table
 
     fixed = {
         "Wasser": 5.0,
@@ -421,23 +473,34 @@ def roll_biom(current_biom: str) -> Tuple[str, str, Optional[str]]:
     choices = [current_biom] + list(fixed_for_roll.keys()) + others
     weights = [current_weight] + list(fixed_for_roll.values()) + [per_other] * len(others)
 
-    rolled = random.choices(choices, weights=weights, k=1)[0]
+    outcomes: List[Tuple[str, str, Optional[str]]] = []
+    for rolled in choices:
+        if rolled == "Stadt/Dorf":
+            outcomes.append((rolled, f"Stadt/Dorf (auf {current_biom})", None))
+        else:
+            outcomes.append((rolled, rolled, rolled))
 
-    if rolled == "Stadt/Dorf":
-        return rolled, f"Stadt/Dorf (auf {current_biom})", None
+    table = (list(itertools.accumulate(weights)), outcomes)
+    _BIOM_ROLL_TABLES[current_biom] = table
+    return table
 
-    return rolled, rolled, rolled
+def roll_biom(current_biom: str) -> Tuple[str, str, Optional[str]]:
+    if current_biom not in ALL_BIOMES:
+        raise ValueError(f"Unbekanntes Biom: {current_biom}")
+
+    cum_weights, outcomes = _biom_roll_table(current_biom)
+    return _RNG.choices(outcomes, cum_weights=cum_weights)[0]
 
 async def setbiom(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not context.args:
-        await update.message.reply_text("🌍 Wähle dein aktuelles Biom aus", reply_markup=build_biom_keyboard())
+        await update.message.reply_text("🌍 Wähle dein aktuelles Biom aus", reply_markup=BIOM_KEYBOARD)
         return
 
     biom_raw = " ".join(context.args).strip()
     biom = normalize_biom(biom_raw)
 
     if not biom:
-        await update.message.reply_text("Unbekanntes Biom. Erlaubt: " + ", ".join(ALL_BIOMES))
+        await update.message.reply_text(UNKNOWN_BIOM_MSG)
         return
 
     if biom == "Stadt/Dorf":
@@ -473,7 +536,7 @@ async def rollbiom(update: Update, context: ContextTypes.DEFAULT_TYPE):
         biom_raw = " ".join(context.args).strip()
         biom_norm = normalize_biom(biom_raw)
         if not biom_norm:
-            await update.message.reply_text("Unbekanntes Biom. Erlaubt: " + ", ".join(ALL_BIOMES))
+            await update.message.reply_text(UNKNOWN_BIOM_MSG)
             return
         if biom_norm == "Stadt/Dorf":
             await update.message.reply_text("Stadt/Dorf liegt immer auf einem Biom. Nutze bitte z.B. /rollbiom Wald 🙂")
@@ -507,11 +570,17 @@ async def rollbiom(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 ENC_CONFIRM, ENC_PICK_BIOM, ENC_PICK_LEVEL = range(3)
 ENCOUNTERS: Dict[str, Dict[str, List[Tuple[int, int, str]]]] = {}
+# Index = W100 Wurf
+ENCOUNTER_LOOKUP: Dict[str, Dict[str, List[Optional[str]]]] = {}
+
+# "00".."99" -> W100 Wert, "00" steht für 100
+_W100_TOKENS: Dict[str, int] = {f"{i:02d}": (i or 100) for i in range(100)}
 
 def _to_int_w100(token: str) -> int:
     token = token.strip()
-    if token == "00":
-        return 100
+    n = _W100_TOKENS.get(token)
+    if n is not None:
+        return n
     return int(token)
 
 def _canonical_level(a: int, b: int) -> str:
@@ -527,31 +596,29 @@ def _canonical_level(a: int, b: int) -> str:
         return "11-20"
     return f"{a}-{b}"
 
+# Reihenfolge ist Priorität: bei mehreren Stichworten gewinnt der erste Eintrag
+_ENC_BIOM_KEYWORDS: Tuple[Tuple[Tuple[str, ...], str], ...] = (
+    (("arktis",), "Arktis"),
+    (("grasland",), "Grasland"),
+    (("hügel", "huegel"), "Hügel"),
+    (("küste", "kueste"), "Küste"),
+    (("sumpf",), "Sumpf"),
+    (("wald",), "Wald"),
+    (("wüste", "wueste"), "Wüste"),
+    (("underdark", "unterreich"), "Unterreich"),
+    (("unterwasser",), "Unterwasser"),
+    (("stadt", "dorf"), "Stadt/Dorf"),
+    (("berg",), "Berg"),
+)
+
+@lru_cache(maxsize=256)
 def _canonical_enc_biom(raw: str) -> str:
     t = (raw or "").strip().lower()
 
-    if "arktis" in t:
-        return "Arktis"
-    if "grasland" in t:
-        return "Grasland"
-    if "hügel" in t or "huegel" in t:
-        return "Hügel"
-    if "küste" in t or "kueste" in t or "küsten" in t or "kuesten" in t:
-        return "Küste"
-    if "sumpf" in t:
-        return "Sumpf"
-    if "wald" in t:
-        return "Wald"
-    if "wüste" in t or "wueste" in t:
-        return "Wüste"
-    if "underdark" in t or "unterreich" in t:
-        return "Unterreich"
-    if "unterwasser" in t:
-        return "Unterwasser"
-    if "stadt" in t or "dorf" in t:
-        return "Stadt/Dorf"
-    if "berg" in t:
-        return "Berg"
+    for keywords, name in _ENC_BIOM_KEYWORDS:
+        for kw in keywords:
+            if kw in t:
+                return name
 
     return raw.strip()
 
@@ -575,18 +642,18 @@ def _clean_enc_line(ln: str) -> str:
         s = s.replace(ch, "-")
     return s.strip()
 
+_ENC_HEADING = re.compile(
+    r"^(?P<biome>.+?)\s*\(\s*Stufe\s*(?P<a>\d+)\s*(?:-|bis)\s*(?P<b>\d+)\s*\)",
+    re.IGNORECASE,
+)
+_ENC_RANGE = re.compile(
+    r"^(?P<s>\d{2})(?:\s*(?:-|bis)\s*(?P<e>\d{2}))?\s*(?P<rest>.*)$",
+    re.IGNORECASE,
+)
+
 def _load_encounters_from_text(text: str) -> Dict[str, Dict[str, List[Tuple[int, int, str]]]]:
     lines = [_clean_enc_line(ln) for ln in text.splitlines()]
 
-    heading_re = re.compile(
-        r"^(?P<biome>.+?)\s*\(\s*Stufe\s*(?P<a>\d+)\s*(?:-|bis)\s*(?P<b>\d+)\s*\)",
-        re.IGNORECASE,
-    )
-    range_re = re.compile(
-        r"^(?P<s>\d{2})(?:\s*(?:-|bis)\s*(?P<e>\d{2}))?\s*(?P<rest>.*)$",
-        re.IGNORECASE,
-    )
-
     data: Dict[str, Dict[str, List[Tuple[int, int, str]]]] = {}
     cur_biome: Optional[str] = None
     cur_level: Optional[str] = None
@@ -607,7 +674,7 @@ def _load_encounters_from_text(text: str) -> Dict[str, Dict[str, List[Tuple[int,
         if not ln:
             continue
 
-        m_head = heading_re.match(ln)
+        m_head = _ENC_HEADING.match(ln)
         if m_head:
             flush_pending()
             cur_biome = _canonical_enc_biom(m_head.group("biome").strip())
@@ -622,7 +689,7 @@ def _load_encounters_from_text(text: str) -> Dict[str, Dict[str, List[Tuple[int,
         if "w100" in low and "begegn" in low:
             continue
 
-        m_rng = range_re.match(ln)
+        m_rng = _ENC_RANGE.match(ln)
         if m_rng and cur_biome and cur_level:
             s = _to_int_w100(m_rng.group("s"))
             e_raw = m_rng.group("e")
@@ -643,11 +710,24 @@ def _load_encounters_from_text(text: str) -> Dict[str, Dict[str, List[Tuple[int,
     flush_pending()
     return data
 
+def _build_w100_lookup(table: List[Tuple[int, int, object]]) -> List[Optional[object]]:
+    flat: List[Optional[object]] = [None] * 101
+    # Rückwärts füllen, damit bei Überschneidungen wie beim linearen Suchen der erste Eintrag gewinnt
+    for a, b, payload in reversed(table):
+        for r in range(max(a, 1), min(b, 100) + 1):
+            flat[r] = payload
+    return flat
+
 def init_encounters():
-    global ENCOUNTERS
+    global ENCOUNTERS, ENCOUNTER_LOOKUP
     raw = _load_encounter_raw_text()
     ENCOUNTERS = _load_encounters_from_text(raw) if raw.strip() else {}
+    ENCOUNTER_LOOKUP = {
+        biom: {level: _build_w100_lookup(table) for level, table in tables.items()}
+        for biom, tables in ENCOUNTERS.items()
+    }
 
+@lru_cache(maxsize=32)
 def build_encounter_confirm_keyboard(current_biom: str) -> InlineKeyboardMarkup:
     rows = [[
         InlineKeyboardButton(f"✅ {current_biom}", callback_data="enc_confirm:yes"),
@@ -679,33 +759,37 @@ def build_encounter_level_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(rows)
 
+ENCOUNTER_BIOM_KEYBOARD = build_encounter_biom_keyboard()
+ENCOUNTER_LEVEL_KEYBOARD = build_encounter_level_keyboard()
+
 def pick_encounter(biom: str, level: str) -> Tuple[int, str]:
     biom = _canonical_enc_biom(biom)
     tables_for_biom = ENCOUNTERS.get(biom, {})
-    table = tables_for_biom.get(level)
+    table_level = level
 
-    if table is None and level in ("11-16", "17-20"):
-        table = tables_for_biom.get("11-20")
+    if table_level not in tables_for_biom and level in ("11-16", "17-20"):
+        table_level = "11-20"
 
-    if not table:
+    if not tables_for_biom.get(table_level):
         available = ", ".join(sorted(tables_for_biom.keys()))
         if not available:
             available = "keine"
         raise KeyError(f"Keine Tabelle für {biom} {level}. Verfügbar: {available}")
 
-    roll_ = random.randint(1, 100)
-    for s, e, txt in table:
-        if s <= roll_ <= e:
-            return roll_, txt
-
-    return roll_, "Nichts gefunden. Deine Tabelle hat an der Stelle vermutlich eine Lücke."
+    roll_ = _roll_die(100)
+    txt = ENCOUNTER_LOOKUP[biom][table_level][roll_]
+    if txt is None:
+        return roll_, "Nichts gefunden. Deine Tabelle hat an der Stelle vermutlich eine Lücke."
+    return roll_, txt
 
-_W_DICE_EXPR = re.compile(r"(\d+)\s*[Ww]\s*(\d+)(\s*[+-]\s*\d+)?")
+_W_DICE_EXPR = re.compile(r"(\d+)\s*w\s*(\d+)(\s*[+-]\s*\d+)?", re.IGNORECASE)
 
 def roll_inline_w_dice(text: str) -> Tuple[str, List[str]]:
     details: List[str] = []
+    out: List[str] = []
+    last = 0
 
-    def repl(m: re.Match) -> str:
+    for m in _W_DICE_EXPR.finditer(text):
         count = int(m.group(1))
         sides = int(m.group(2))
         mod_raw = m.group(3)
@@ -713,15 +797,21 @@ def roll_inline_w_dice(text: str) -> Tuple[str, List[str]]:
         if mod_raw:
             mod = int(mod_raw.replace(" ", ""))
 
-        rolls = [random.randint(1, sides) for _ in range(count)]
+        rolls = _roll_dice(count, sides)
         total = sum(rolls) + mod
 
         mod_txt = f"{mod:+d}" if mod else ""
         details.append(f"{count}W{sides}{mod_txt} = {total} (Würfe: {', '.join(map(str, rolls))})")
-        return str(total)
 
-    rolled_text = _W_DICE_EXPR.sub(repl, text)
-    return rolled_text, details
+        out.append(text[last:m.start()])
+        out.append(str(total))
+        last = m.end()
+
+    if not out:
+        return text, details
+
+    out.append(text[last:])
+    return "".join(out), details
 
 async def rollencounter_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not ENCOUNTERS:
@@ -737,14 +827,14 @@ async def rollencounter_start(update: Update, context: ContextTypes.DEFAULT_TYPE
         biom_norm = _biom_for_encounter_from_current(biom_norm)
         context.user_data["enc_biome"] = biom_norm
 
-        await update.message.reply_text(f"⚔️ Biom: {biom_norm}\nWelche Stufe?", reply_markup=build_encounter_level_keyboard())
+        await update.message.reply_text(f"⚔️ Biom: {biom_norm}\nWelche Stufe?", reply_markup=ENCOUNTER_LEVEL_KEYBOARD)
         return ENC_PICK_LEVEL
 
     current = context.user_data.get("current_biom")
     if not current:
         await update.message.reply_text(
             "Ich kenne dein aktuelles Biom noch nicht.\nSetze es bitte erst mit /setbiom 🙂",
-            reply_markup=build_biom_keyboard()
+            reply_markup=BIOM_KEYBOARD
         )
         return ConversationHandler.END
 
@@ -764,10 +854,10 @@ async def rollencounter_confirm(update: Update, context: ContextTypes.DEFAULT_TY
     choice = query.data.split(":", 1)[1]
     if choice == "yes":
         biom = context.user_data.get("enc_biome", "Unbekannt")
-        await query.edit_message_text(f"⚔️ Biom: {biom}\nWelche Stufe?", reply_markup=build_encounter_level_keyboard())
+        await query.edit_message_text(f"⚔️ Biom: {biom}\nWelche Stufe?", reply_markup=ENCOUNTER_LEVEL_KEYBOARD)
         return ENC_PICK_LEVEL
 
-    await query.edit_message_text("⚔️ Welches Biom?", reply_markup=build_encounter_biom_keyboard())
+    await query.edit_message_text("⚔️ Welches Biom?", reply_markup=ENCOUNTER_BIOM_KEYBOARD)
     return ENC_PICK_BIOM
 
 async def rollencounter_pick_biom(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -777,7 +867,7 @@ async def rollencounter_pick_biom(update: Update, context: ContextTypes.DEFAULT_
     biom_ = query.data.split(":", 1)[1]
     context.user_data["enc_biome"] = biom_
 
-    await query.edit_message_text(f"⚔️ Biom: {biom_}\nWelche Stufe?", reply_markup=build_encounter_level_keyboard())
+    await query.edit_message_text(f"⚔️ Biom: {biom_}\nWelche Stufe?", reply_markup=ENCOUNTER_LEVEL_KEYBOARD)
     return ENC_PICK_LEVEL
 
 async def rollencounter_pick_level(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -791,17 +881,25 @@ async def rollencounter_pick_level(update: Update, context: ContextTypes.DEFAULT
         w100, encounter_raw = pick_encounter(biom_, level)
         encounter_rolled, dice_details = roll_inline_w_dice(encounter_raw)
 
-        msg = (
-            f"⚔️ Encounter\n"
-            f"Biom: {_canonical_enc_biom(biom_)}\n"
-            f"Stufe: {level}\n"
-            f"W100: {w100:02d}\n\n"
-            f"Begegnung (Tabelle):\n{encounter_raw}\n\n"
-            f"Begegnung (ausgewürfelt):\n{encounter_rolled}"
-        )
+        parts = [
+            "⚔️ Encounter",
+            f"Biom: {_canonical_enc_biom(biom_)}",
+            f"Stufe: {level}",
+            f"W100: {w100:02d}",
+            "",
+            "Begegnung (Tabelle):",
+            encounter_raw,
+            "",
+            "Begegnung (ausgewürfelt):",
+            encounter_rolled,
+        ]
 
         if dice_details:
-            msg += "\n\nWürfe:\n" + "\n".join(dice_details)
+            parts.append("")
+            parts.append("Würfe:")
+            parts.extend(dice_details)
+
+        msg = "\n".join(parts)
 
     except KeyError as e:
         msg = (
@@ -846,53 +944,39 @@ ATTR_TABLE = {
 }
 
 def _roll_sum(count: int, sides: int) -> Tuple[int, List[int]]:
-    rolls = [random.randint(1, sides) for _ in range(count)]
+    rolls = _roll_dice(count, sides)
     return sum(rolls), rolls
 
 def _apply_next_reward_bonus_if_any(context: ContextTypes.DEFAULT_TYPE) -> Tuple[int, Optional[str]]:
     if context.user_data.get("next_reward_bonus_d10x10"):
         context.user_data["next_reward_bonus_d10x10"] = False
-        bonus = random.randint(1, 10) * 10
+        bonus = _roll_die(10) * 10
         return bonus, f"Bonus (Merker): 1W10x10 = {bonus} GM"
     return 0, None
 
+# W100 -> (SG, Würfelanzahl, Seiten, Multiplikator, Magic Item)
+CHANCE_REWARD_TABLE: List[Tuple[int, int, Tuple[int, int, int, int, bool]]] = [
+    (1, 40, (10, 1, 10, 10, False)),
+    (41, 75, (15, 2, 10, 10, False)),
+    (76, 90, (18, 4, 10, 10, False)),
+    (91, 98, (22, 6, 10, 10, False)),
+    (99, 100, (30, 1, 4, 1000, True)),
+]
+CHANCE_REWARD_BOUNDS = _range_table_bounds(CHANCE_REWARD_TABLE)
+
 async def rollchance(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    skill_roll = random.randint(1, 6)
+    skill_roll = _roll_die(6)
     attr, emoji = ATTR_TABLE[skill_roll]
 
-    w100 = random.randint(1, 100)
+    w100 = _roll_die(100)
 
-    sg = 10
-    reward = 0
-    reward_text = ""
-    magic_item = False
-
-    if 1 <= w100 <= 40:
-        sg = 10
-        base, _r = _roll_sum(1, 10)
-        reward = base * 10
-        reward_text = f"{reward} GM"
-    elif 41 <= w100 <= 75:
-        sg = 15
-        base, _r = _roll_sum(2, 10)
-        reward = base * 10
-        reward_text = f"{reward} GM"
-    elif 76 <= w100 <= 90:
-        sg = 18
-        base, _r = _roll_sum(4, 10)
-        reward = base * 10
-        reward_text = f"{reward} GM"
-    elif 91 <= w100 <= 98:
-        sg = 22
-        base, _r = _roll_sum(6, 10)
-        reward = base * 10
-        reward_text = f"{reward} GM"
-    else:
-        sg = 30
-        base, _r = _roll_sum(1, 4)
-        reward = base * 1000
+    sg, count, sides, mult, magic_item = _pick_range_bounds(CHANCE_REWARD_BOUNDS, w100)
+    base, _r = _roll_sum(count, sides)
+    reward = base * mult
+    if magic_item:
         reward_text = f"{reward} GM + 1x Magic Item"
-        magic_item = True
+    else:
+        reward_text = f"{reward} GM"
 
     bonus, bonus_line = _apply_next_reward_bonus_if_any(context)
     if bonus:
@@ -902,29 +986,31 @@ async def rollchance(update: Update, context: ContextTypes.DEFAULT_TYPE):
         else:
             reward_text = f"{reward} GM"
 
-    msg = (
-        f"🎯 Rollchance\n"
-        f"Skillwurf 1W6: {skill_roll}\n"
-        f"Attribut: {attr} {emoji}\n"
-        f"W100: {w100:02d}\n"
-    )
+    parts = [
+        "🎯 Rollchance",
+        f"Skillwurf 1W6: {skill_roll}",
+        f"Attribut: {attr} {emoji}",
+        f"W100: {w100:02d}",
+    ]
 
     if bonus_line:
-        msg += f"{bonus_line}\n"
+        parts.append(bonus_line)
 
-    msg += (
-        f"\nDein Skill SG ist {sg} für {attr} {emoji}. "
+    parts.append("")
+    parts.append(
+        f"Dein Skill SG ist {sg} für {attr} {emoji}. "
         f"Deine Belohnung ist {reward_text} (W100: {w100:02d}). "
         f"Viel Erfolg 😊"
     )
 
-    await update.message.reply_text(msg)
+    await update.message.reply_text("\n".join(parts))
 
 # -----------------------
 # ROLLHUNT SYSTEM
 # -----------------------
 
 HUNT_MOD_CHOICES = list(range(-4, 7))
+HUNT_MOD_SET = frozenset(HUNT_MOD_CHOICES)
 
 def build_hunt_mod_keyboard() -> InlineKeyboardMarkup:
     rows = []
@@ -940,52 +1026,61 @@ def build_hunt_mod_keyboard() -> InlineKeyboardMarkup:
     rows.append([InlineKeyboardButton("Abbrechen", callback_data="hunt_cancel")])
     return InlineKeyboardMarkup(rows)
 
+HUNT_MOD_KEYBOARD = build_hunt_mod_keyboard()
+
+# Index = Gesamtwurf 5 bis 20, Werte darunter bzw. darüber zählen wie der Rand
+HUNT_MIN_TOTAL = 5
+HUNT_MAX_TOTAL = 20
+HUNT_OUTCOMES = (
+    ("Kein Erfolg",)
+    + ("Tierspuren gefunden",) * 5
+    + ("Beeren oder Muscheln (1x Ration) + 10 XP",) * 5
+    + ("Jagderfolg, normale Beute (2x Ration)",) * 4
+    + ("Jagderfolg, sehr gute Beute + Tierfell (10 GM Wert)",)
+)
+
 def hunt_outcome_text(total: int) -> str:
-    if total <= 5:
-        return "Kein Erfolg"
-    if 6 <= total <= 10:
-        return "Tierspuren gefunden"
-    if 11 <= total <= 15:
-        return "Beeren oder Muscheln (1x Ration) + 10 XP"
-    if 16 <= total <= 19:
-        return "Jagderfolg, normale Beute (2x Ration)"
-    return "Jagderfolg, sehr gute Beute + Tierfell (10 GM Wert)"
+    return HUNT_OUTCOMES[min(max(total, HUNT_MIN_TOTAL), HUNT_MAX_TOTAL) - HUNT_MIN_TOTAL]
+
+_HUNT_ROLL_TMPL = "Wurf: 1W20 (%d) + Mod (%+d) = %d\nErgebnis: %s"
+_HUNT_REROLL_TMPL = (
+    "Spuren gefunden, du würfelst nochmal\n"
+    "Neuer Wurf: 1W20 (%d) + Mod (%+d) = %d\n"
+    "Neues Ergebnis: %s"
+)
+
+def _hunt_roll_message(mod: int, show_mod: bool = False) -> str:
+    roll1 = _roll_die(20)
+    total1 = roll1 + mod
+    first_txt = hunt_outcome_text(total1)
+
+    parts = ["🏹 Rollhunt"]
+    if show_mod:
+        parts.append("Mod: %+d" % mod)
+    parts.append(_HUNT_ROLL_TMPL % (roll1, mod, total1, first_txt))
+
+    # Bei Spuren wird einmal nachgewürfelt
+    if 6 <= total1 <= 10:
+        roll2 = _roll_die(20)
+        total2 = roll2 + mod
+        second_txt = hunt_outcome_text(total2)
+        parts.append("")
+        parts.append(_HUNT_REROLL_TMPL % (roll2, mod, total2, second_txt))
+
+    return "\n".join(parts)
 
 async def rollhunt(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    if context.args:
-        try:
-            mod = int(context.args[0])
-            if mod not in HUNT_MOD_CHOICES:
-                raise ValueError
+    arg = context.args[0] if context.args else ""
+    if _INT_ARG.fullmatch(arg):
+        mod = int(arg)
+        if mod in HUNT_MOD_SET:
             context.user_data["hunt_mod"] = mod
-            roll1 = random.randint(1, 20)
-            total1 = roll1 + mod
-            first_txt = hunt_outcome_text(total1)
-
-            msg = (
-                f"🏹 Rollhunt\n"
-                f"Wurf: 1W20 ({roll1}) + Mod ({mod:+d}) = {total1}\n"
-                f"Ergebnis: {first_txt}"
-            )
-
-            if 6 <= total1 <= 10:
-                roll2 = random.randint(1, 20)
-                total2 = roll2 + mod
-                second_txt = hunt_outcome_text(total2)
-                msg += (
-                    f"\n\nSpuren gefunden, du würfelst nochmal\n"
-                    f"Neuer Wurf: 1W20 ({roll2}) + Mod ({mod:+d}) = {total2}\n"
-                    f"Neues Ergebnis: {second_txt}"
-                )
-
-            await update.message.reply_text(msg)
+            await update.message.reply_text(_hunt_roll_message(mod))
             return
-        except Exception:
-            pass
 
     await update.message.reply_text(
         "🏹 Rollhunt\nWie hoch ist deine Mod von WEI oder Überlebenskunst oder Naturkunde? Wähle den passenden Wert 🙂",
-        reply_markup=build_hunt_mod_keyboard()
+        reply_markup=HUNT_MOD_KEYBOARD
     )
 
 async def rollhunt_pick_mod(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -999,34 +1094,12 @@ async def rollhunt_pick_mod(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await query.edit_message_text("Ungültiger Mod. Nutze /rollhunt erneut 🙂")
         return
 
-    if mod not in HUNT_MOD_CHOICES:
+    if mod not in HUNT_MOD_SET:
         await query.edit_message_text("Mod muss zwischen -4 und 6 liegen. Nutze /rollhunt erneut 🙂")
         return
 
     context.user_data["hunt_mod"] = mod
-
-    roll1 = random.randint(1, 20)
-    total1 = roll1 + mod
-    first_txt = hunt_outcome_text(total1)
-
-    msg = (
-        f"🏹 Rollhunt\n"
-        f"Mod: {mod:+d}\n"
-        f"Wurf: 1W20 ({roll1}) + Mod ({mod:+d}) = {total1}\n"
-        f"Ergebnis: {first_txt}"
-    )
-
-    if 6 <= total1 <= 10:
-        roll2 = random.randint(1, 20)
-        total2 = roll2 + mod
-        second_txt = hunt_outcome_text(total2)
-        msg += (
-            f"\n\nSpuren gefunden, du würfelst nochmal\n"
-            f"Neuer Wurf: 1W20 ({roll2}) + Mod ({mod:+d}) = {total2}\n"
-            f"Neues Ergebnis: {second_txt}"
-        )
-
-    await query.edit_message_text(msg)
+    await query.edit_message_text(_hunt_roll_message(mod, show_mod=True))
 
 async def rollhunt_cancel_cb(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
@@ -1046,69 +1119,96 @@ def build_waldkarte_level_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(rows)
 
-async def rollwaldkarte(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    roll18 = random.randint(1, 18)
+WALDKARTE_LEVEL_KEYBOARD = build_waldkarte_level_keyboard()
 
-    if 1 <= roll18 <= 7:
-        await update.message.reply_text(f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: Skillchance")
-        await rollchance(update, context)
-        return
+async def _waldkarte_skill(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int):
+    await update.message.reply_text(f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: Skillchance")
+    await rollchance(update, context)
 
-    if 8 <= roll18 <= 11:
-        await update.message.reply_text(f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: Ruhe\nDu kannst jagen, chillen oder trainieren 🙂")
-        return
+async def _waldkarte_ruhe(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int):
+    await update.message.reply_text(f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: Ruhe\nDu kannst jagen, chillen oder trainieren 🙂")
 
-    if roll18 == 12:
-        d4 = random.randint(1, 4)
-        mapping = {1: "Ruine", 2: "Händler", 3: "Dorf", 4: "Gasthaus"}
-        await update.message.reply_text(f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: Ortschaft außerhalb der Karte\nW4: {d4} -> {mapping[d4]}")
-        return
+WALDKARTE_ORTE = ("Ruine", "Händler", "Dorf", "Gasthaus")
 
-    if roll18 in (13, 14):
-        context.user_data["waldkarte_pending"] = {"type": "encounter", "card_roll": roll18}
-        await update.message.reply_text("🌲 Waldkarte\nErgebnis: Encounter\nWähle die Stufe:", reply_markup=build_waldkarte_level_keyboard())
-        return
+async def _waldkarte_ort(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int):
+    d4 = _roll_die(4)
+    await update.message.reply_text(f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: Ortschaft außerhalb der Karte\nW4: {d4} -> {WALDKARTE_ORTE[d4 - 1]}")
 
-    if roll18 in (15, 16):
-        d6 = random.randint(1, 6)
+async def _waldkarte_encounter(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int):
+    context.user_data["waldkarte_pending"] = {"type": "encounter", "card_roll": roll18}
+    await update.message.reply_text("🌲 Waldkarte\nErgebnis: Encounter\nWähle die Stufe:", reply_markup=WALDKARTE_LEVEL_KEYBOARD)
 
-        if d6 == 1:
-            a = random.randint(1, 10)
-            b = random.randint(1, 10)
-            gold = (a + b) * 10
-            await update.message.reply_text(f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: Entdeckung\nW6: {d6} -> Truhe\n2W10: {a} + {b} = {a + b}\nBelohnung: {gold} GM")
-            return
+# Gemeinsamer Kopf aller Entdeckung-Antworten, gefüllt mit W18 und W6
+_WALDKARTE_ENTDECKUNG_HEAD = "🌲 Waldkarte\nW18: %d\nErgebnis: Entdeckung\nW6: %d -> "
 
-        if d6 == 2:
-            await update.message.reply_text(f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: Entdeckung\nW6: {d6} -> 50% Rabatt Händler")
-            return
+async def _entdeckung_truhe(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int, d6: int):
+    a, b = _roll_dice(2, 10)
+    gold = (a + b) * 10
+    await update.message.reply_text(_WALDKARTE_ENTDECKUNG_HEAD % (roll18, d6) + f"Truhe\n2W10: {a} + {b} = {a + b}\nBelohnung: {gold} GM")
 
-        if d6 == 3:
-            await update.message.reply_text(f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: Entdeckung\nW6: {d6} -> Zauberschriften Händler")
-            return
+async def _entdeckung_rabatt(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int, d6: int):
+    await update.message.reply_text(_WALDKARTE_ENTDECKUNG_HEAD % (roll18, d6) + "50% Rabatt Händler")
 
-        if d6 == 4:
-            context.user_data["next_reward_bonus_d10x10"] = True
-            await update.message.reply_text(f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: Entdeckung\nW6: {d6} -> Merker\nBei deiner nächsten Belohnung bekommst du zusätzlich 1W10x10 GM 🙂")
-            return
+async def _entdeckung_zauberschriften(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int, d6: int):
+    await update.message.reply_text(_WALDKARTE_ENTDECKUNG_HEAD % (roll18, d6) + "Zauberschriften Händler")
 
-        if d6 == 5:
-            await update.message.reply_text(f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: Entdeckung\nW6: {d6} -> 1x Inspiration")
-            return
+async def _entdeckung_merker(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int, d6: int):
+    context.user_data["next_reward_bonus_d10x10"] = True
+    await update.message.reply_text(_WALDKARTE_ENTDECKUNG_HEAD % (roll18, d6) + "Merker\nBei deiner nächsten Belohnung bekommst du zusätzlich 1W10x10 GM 🙂")
 
-        context.user_data["omen_bonus_d6"] = True
-        await update.message.reply_text(f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: Entdeckung\nW6: {d6} -> Omen\nMerker: Du kannst 1W6 zu jedem Wurf dazunehmen 🙂")
-        return
+async def _entdeckung_inspiration(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int, d6: int):
+    await update.message.reply_text(_WALDKARTE_ENTDECKUNG_HEAD % (roll18, d6) + "1x Inspiration")
 
-    if roll18 == 17:
-        context.user_data["waldkarte_pending"] = {"type": "hort", "card_roll": roll18}
-        await update.message.reply_text("🌲 Waldkarte\nErgebnis: Kreaturenhort\nWähle die Stufe:", reply_markup=build_waldkarte_level_keyboard())
-        return
+async def _entdeckung_omen(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int, d6: int):
+    context.user_data["omen_bonus_d6"] = True
+    await update.message.reply_text(_WALDKARTE_ENTDECKUNG_HEAD % (roll18, d6) + "Omen\nMerker: Du kannst 1W6 zu jedem Wurf dazunehmen 🙂")
+
+# Index = W6 Wurf, Index 0 bleibt leer
+WALDKARTE_D6_HANDLERS = (
+    None,
+    _entdeckung_truhe,
+    _entdeckung_rabatt,
+    _entdeckung_zauberschriften,
+    _entdeckung_merker,
+    _entdeckung_inspiration,
+    _entdeckung_omen,
+)
+
+async def _waldkarte_entdeckung(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int):
+    d6 = _roll_die(6)
+    await WALDKARTE_D6_HANDLERS[d6](update, context, roll18, d6)
 
+async def _waldkarte_hort(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int):
+    context.user_data["waldkarte_pending"] = {"type": "hort", "card_roll": roll18}
+    await update.message.reply_text("🌲 Waldkarte\nErgebnis: Kreaturenhort\nWähle die Stufe:", reply_markup=WALDKARTE_LEVEL_KEYBOARD)
+
+async def _waldkarte_npc(update: Update, context: ContextTypes.DEFAULT_TYPE, roll18: int):
     await update.message.reply_text(
         f"🌲 Waldkarte\nW18: {roll18}\nErgebnis: NPC\nEin NPC gibt dir eine Wegbeschreibung zum Portal oder die Info, die du suchst."
     )
 
+# Index = W18 Wurf, Index 0 bleibt leer
+WALDKARTE_HANDLERS = (
+    (None,)
+    + (_waldkarte_skill,) * 7
+    + (_waldkarte_ruhe,) * 4
+    + (_waldkarte_ort,)
+    + (_waldkarte_encounter,) * 2
+    + (_waldkarte_entdeckung,) * 2
+    + (_waldkarte_hort,)
+    + (_waldkarte_npc,)
+)
+
+# Titel und Schlusssatz für die offene Stufenwahl, nach Art der gezogenen Karte
+WALDKARTE_PENDING_TEXTS: Dict[str, Tuple[str, str]] = {
+    "encounter": ("Encounter", "Viel Spaß 🙂"),
+    "hort": ("Kreaturenhort", "Das ist die Kreatur, die den Hort hält oder bewacht."),
+}
+
+async def rollwaldkarte(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    roll18 = _roll_die(18)
+    await WALDKARTE_HANDLERS[roll18](update, context, roll18)
+
 async def rollwaldkarte_pick_level(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     await query.answer()
@@ -1140,8 +1240,7 @@ async def rollwaldkarte_pick_level(update: Update, context: ContextTypes.DEFAULT
         w100, encounter_raw = pick_encounter(biome, level)
         encounter_rolled, dice_details = roll_inline_w_dice(encounter_raw)
 
-        title = "Kreaturenhort" if kind == "hort" else "Encounter"
-        extra = "Das ist die Kreatur, die den Hort hält oder bewacht." if kind == "hort" else "Viel Spaß 🙂"
+        title, extra = WALDKARTE_PENDING_TEXTS.get(kind, WALDKARTE_PENDING_TEXTS["encounter"])
 
         msg = (
             f"🌲 Waldkarte\n"
@@ -1166,18 +1265,18 @@ async def rollwaldkarte_pick_level(update: Update, context: ContextTypes.DEFAULT
 # ROLLPLAYERBEHAVIOUR SYSTEM
 # -----------------------
 
-PLAYER_BEHAVIOUR_TABLE = {
-    1: ("Chaotisch Dumm", "Du stehst vor einer Tür, was tust du? Schlüssel gegen Tür werfen!"),
-    2: ("Chaotisch", "Du stehst vor einer Tür, was tust du? Schlüssel gegen Tür werfen und auf das Schloss zielen!"),
-    3: ("Neutral Neutral", "Du stehst vor einer Tür, was tust du? Schlüssel ins Schloss stecken."),
-    4: ("Neutral Prüfend", "Du stehst vor einer Tür, was tust du? An der Tür stehen, Schlüssel betrachten und ins Schloss stecken."),
-    5: ("Logisch", "Du stehst vor einer Tür, was tust du? An der Tür lauschen und Entscheidung treffen, ggf die Tür zu öffnen."),
-    6: ("Logisch Intelligent", "Du stehst vor einer Tür, was tust du? Lauschen, durch das Schlüsselloch schauen und vorbereiten."),
-}
+PLAYER_BEHAVIOUR_TABLE = (
+    ("Chaotisch Dumm", "Du stehst vor einer Tür, was tust du? Schlüssel gegen Tür werfen!"),
+    ("Chaotisch", "Du stehst vor einer Tür, was tust du? Schlüssel gegen Tür werfen und auf das Schloss zielen!"),
+    ("Neutral Neutral", "Du stehst vor einer Tür, was tust du? Schlüssel ins Schloss stecken."),
+    ("Neutral Prüfend", "Du stehst vor einer Tür, was tust du? An der Tür stehen, Schlüssel betrachten und ins Schloss stecken."),
+    ("Logisch", "Du stehst vor einer Tür, was tust du? An der Tür lauschen und Entscheidung treffen, ggf die Tür zu öffnen."),
+    ("Logisch Intelligent", "Du stehst vor einer Tür, was tust du? Lauschen, durch das Schlüsselloch schauen und vorbereiten."),
+)
 
 async def rollplayerbehaviour(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    r = random.randint(1, 6)
-    title, example = PLAYER_BEHAVIOUR_TABLE[r]
+    r = _roll_die(6)
+    title, example = PLAYER_BEHAVIOUR_TABLE[r - 1]
 
     msg = (
         f"🎭 Rollplayer Behaviour\n"
@@ -1194,45 +1293,47 @@ async def rollplayerbehaviour(update: Update, context: ContextTypes.DEFAULT_TYPE
 TREASURE_KIND_STATE = 200
 TREASURE_CR_STATE = 201
 
-COIN_ORDER = ["KM", "SM", "EM", "GM", "PM"]
+COIN_ORDER = ("KM", "SM", "EM", "GM", "PM")
+COIN_INDEX = {coin: i for i, coin in enumerate(COIN_ORDER)}
 
+@lru_cache(maxsize=4096)
 def _fmt_int(n: int) -> str:
     return f"{n:,}".replace(",", ".")
 
-def _fmt_w100(n: int) -> str:
-    return "00" if n == 100 else f"{n:02d}"
+_W100_STR = tuple(f"{i:02d}" for i in range(100))
 
-def _roll_nds(count: int, sides: int) -> Tuple[int, List[int]]:
-    rolls = [random.randint(1, sides) for _ in range(count)]
-    return sum(rolls), rolls
+def _fmt_w100(n: int) -> str:
+    if 1 <= n <= 100:
+        return _W100_STR[n % 100]
+    return f"{n:02d}"
 
 def _roll_coin_spec(coin: str, count: int, sides: int, mult: int) -> Tuple[int, str]:
-    base, rolls = _roll_nds(count, sides)
+    return _coin_spec_result(coin, count, sides, mult, _roll_dice(count, sides))
+
+def _coin_spec_result(coin: str, count: int, sides: int, mult: int, rolls: List[int]) -> Tuple[int, str]:
+    base = sum(rolls)
     total = base * mult
+    rolls_str = str(rolls[0]) if count == 1 else ", ".join(map(str, rolls))
     if mult == 1:
-        detail = f"{coin}: {count}W{sides} = {base} (Würfe: {', '.join(map(str, rolls))})"
+        detail = f"{coin}: {count}W{sides} = {base} (Würfe: {rolls_str})"
     else:
-        detail = f"{coin}: {count}W{sides} x {_fmt_int(mult)} = {_fmt_int(total)} (Basis {base}, Würfe: {', '.join(map(str, rolls))})"
+        detail = f"{coin}: {count}W{sides} x {_fmt_int(mult)} = {_fmt_int(total)} (Basis {base}, Würfe: {rolls_str})"
     return total, detail
 
+_COUNT_EXPR = re.compile(r"^(\d+)w(\d+)$", re.IGNORECASE)
+
 def _roll_count_expr(expr: str) -> Tuple[int, str]:
     e = (expr or "").strip()
     if e == "1":
         return 1, "1"
-    m = re.match(r"^(\d+)[Ww](\d+)$", e)
+    m = _COUNT_EXPR.match(e)
     if not m:
         return 1, "1"
     c = int(m.group(1))
     s = int(m.group(2))
-    total, rolls = _roll_nds(c, s)
+    total, rolls = _roll_sum(c, s)
     return total, f"{c}W{s} = {total} (Würfe: {', '.join(map(str, rolls))})"
 
-def _pick_range_table(table: List[Tuple[int, int, object]], roll_: int):
-    for a, b, payload in table:
-        if a <= roll_ <= b:
-            return payload
-    return None
-
 INDIVIDUAL_TREASURE: Dict[str, List[Tuple[int, int, List[Tuple[str, int, int, int]]]]] = {
     "0-4": [
         (1, 30, [("KM", 5, 6, 1)]),
@@ -1261,11 +1362,15 @@ INDIVIDUAL_TREASURE: Dict[str, List[Tuple[int, int, List[Tuple[str, int, int, in
     ],
 }
 
+INDIVIDUAL_TREASURE_BOUNDS = {cr: _range_table_bounds(table) for cr, table in INDIVIDUAL_TREASURE.items()}
+
 # -----------------------
 # MAGIC TABLES A BIS I (aus Datei)
 # -----------------------
 
 MAGIC_TABLES: Dict[str, List[Tuple[int, int, str]]] = {}
+# Index = W100 Wurf -> (Gegenstand, Unterwurf oder None)
+MAGIC_LOOKUP: Dict[str, List[Optional[Tuple[str, Optional[Tuple[str, str, Tuple[str, ...]]]]]]] = {}
 
 def _load_magic_raw_text() -> str:
     path = Path(__file__).with_name("Magische Gegenstände Tabelle.txt")
@@ -1286,22 +1391,22 @@ def _clean_magic_line(ln: str) -> str:
 
 def _normalize_magic_item_text(txt: str) -> str:
     t = (txt or "").strip()
-    t = re.sub(r"\s+", " ", t)
+    t = _WHITESPACE.sub(" ", t)
     return t
 
+_MAGIC_HEAD = re.compile(r"^\s*Magische\s+Gegenstände\s+Tabelle\s+([A-I])\s*$", re.IGNORECASE)
+_MAGIC_ENTRY = re.compile(
+    r"^(?P<s>\d{2}|00)\s*(?:-|bis)\s*(?P<e>\d{2}|00)\s*:\s*(?P<item>.+?)\s*$",
+    re.IGNORECASE,
+)
+_MAGIC_ENTRY_SINGLE = re.compile(
+    r"^(?P<s>\d{2}|00)\s*:\s*(?P<item>.+?)\s*$",
+    re.IGNORECASE,
+)
+
 def _load_magic_tables_from_text(text: str) -> Dict[str, List[Tuple[int, int, str]]]:
     lines = [_clean_magic_line(ln) for ln in text.splitlines()]
 
-    head_re = re.compile(r"^\s*Magische\s+Gegenstände\s+Tabelle\s+([A-I])\s*$", re.IGNORECASE)
-    entry_re = re.compile(
-        r"^(?P<s>\d{2}|00)\s*(?:-|bis)\s*(?P<e>\d{2}|00)\s*:\s*(?P<item>.+?)\s*$",
-        re.IGNORECASE,
-    )
-    entry_single_re = re.compile(
-        r"^(?P<s>\d{2}|00)\s*:\s*(?P<item>.+?)\s*$",
-        re.IGNORECASE,
-    )
-
     data: Dict[str, List[Tuple[int, int, str]]] = {}
     cur: Optional[str] = None
 
@@ -1309,7 +1414,7 @@ def _load_magic_tables_from_text(text: str) -> Dict[str, List[Tuple[int, int, st
         if not ln:
             continue
 
-        m_head = head_re.match(ln)
+        m_head = _MAGIC_HEAD.match(ln)
         if m_head:
             cur = m_head.group(1).upper()
             data.setdefault(cur, [])
@@ -1327,7 +1432,7 @@ def _load_magic_tables_from_text(text: str) -> Dict[str, List[Tuple[int, int, st
         if low.startswith("w8") or low.startswith("w12"):
             continue
 
-        m_ent = entry_re.match(ln)
+        m_ent = _MAGIC_ENTRY.match(ln)
         if m_ent:
             s = _to_int_w100(m_ent.group("s"))
             e = _to_int_w100(m_ent.group("e"))
@@ -1337,7 +1442,7 @@ def _load_magic_tables_from_text(text: str) -> Dict[str, List[Tuple[int, int, st
             data.setdefault(cur, []).append((s, e, item))
             continue
 
-        m_one = entry_single_re.match(ln)
+        m_one = _MAGIC_ENTRY_SINGLE.match(ln)
         if m_one:
             s = _to_int_w100(m_one.group("s"))
             item = _normalize_magic_item_text(m_one.group("item"))
@@ -1350,60 +1455,71 @@ def _load_magic_tables_from_text(text: str) -> Dict[str, List[Tuple[int, int, st
     return data
 
 def init_magic_tables():
-    global MAGIC_TABLES
+    global MAGIC_TABLES, MAGIC_LOOKUP
     raw = _load_magic_raw_text()
     MAGIC_TABLES = _load_magic_tables_from_text(raw) if raw.strip() else {}
+    MAGIC_LOOKUP = {
+        letter: _build_w100_lookup([(a, b, (txt, _magic_subroll(letter, txt))) for a, b, txt in entries])
+        for letter, entries in MAGIC_TABLES.items()
+    }
 
-FIGURINES_W8 = {
-    1: "Bronze Greif",
-    2: "Ebenholz Fliege",
-    3: "Goldene Löwen",
-    4: "Elfenbein Ziegen",
-    5: "Marmor Elefant",
-    6: "Onyx Hund",
-    7: "Onyx Hund",
-    8: "Serpentin Eule",
-}
+FIGURINES_W8 = (
+    "Bronze Greif",
+    "Ebenholz Fliege",
+    "Goldene Löwen",
+    "Elfenbein Ziegen",
+    "Marmor Elefant",
+    "Onyx Hund",
+    "Onyx Hund",
+    "Serpentin Eule",
+)
 
-MAGIC_ARMOR_W12 = {
-    1: "Rüstung +2 Plattenpanzer",
-    2: "Rüstung +2 Plattenpanzer",
-    3: "Rüstung +2 Ritterrüstung",
-    4: "Rüstung +2 Ritterrüstung",
-    5: "Rüstung +3 beschlagenes Leder",
-    6: "Rüstung +3 beschlagenes Leder",
-    7: "Rüstung +3 Brustplatte",
-    8: "Rüstung +3 Brustplatte",
-    9: "Rüstung +3 Schienenpanzer",
-    10: "Rüstung +3 Schienenpanzer",
-    11: "Rüstung +3 Plattenpanzer",
-    12: "Rüstung +3 Ritterrüstung",
+MAGIC_ARMOR_W12 = (
+    "Rüstung +2 Plattenpanzer",
+    "Rüstung +2 Plattenpanzer",
+    "Rüstung +2 Ritterrüstung",
+    "Rüstung +2 Ritterrüstung",
+    "Rüstung +3 beschlagenes Leder",
+    "Rüstung +3 beschlagenes Leder",
+    "Rüstung +3 Brustplatte",
+    "Rüstung +3 Brustplatte",
+    "Rüstung +3 Schienenpanzer",
+    "Rüstung +3 Schienenpanzer",
+    "Rüstung +3 Plattenpanzer",
+    "Rüstung +3 Ritterrüstung",
+)
+
+# Einträge, die noch einen Unterwurf brauchen: Tabelle -> (Stichwort, Wurf-Label, Untertabelle)
+MAGIC_SUBROLLS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    "G": ("Figur der wundersamen Kraft", "W8 Figur", FIGURINES_W8),
+    "I": ("Magische Rüstung", "W12 Rüstung", MAGIC_ARMOR_W12),
 }
 
-def _pick_magic_item(table_letter: str) -> Tuple[int, str, List[str]]:
-    r = random.randint(1, 100)
+def _magic_subroll(table_letter: str, item: str) -> Optional[Tuple[str, str, Tuple[str, ...]]]:
+    sub = MAGIC_SUBROLLS.get(table_letter)
+    if sub and sub[0] in item:
+        return sub
+    return None
+
+def _pick_magic_item(table_letter: str, r: Optional[int] = None) -> Tuple[int, str, List[str]]:
+    if r is None:
+        r = _roll_die(100)
     entries = MAGIC_TABLES.get(table_letter)
     if not entries:
         return r, f"Unbekannte Tabelle {table_letter}", []
 
-    item = "Unbekannt"
-    for a, b, txt in entries:
-        if a <= r <= b:
-            item = txt
-            break
-
-    extra_details: List[str] = []
-    if table_letter == "G" and "Figur der wundersamen Kraft" in item:
-        r8 = random.randint(1, 8)
-        item = f"Figur der wundersamen Kraft ({FIGURINES_W8[r8]})"
-        extra_details.append(f"W8 Figur: {r8} -> {FIGURINES_W8[r8]}")
+    hit = MAGIC_LOOKUP[table_letter][r]
+    if hit is None:
+        return r, "Unbekannt", []
 
-    if table_letter == "I" and "Magische Rüstung" in item:
-        r12 = random.randint(1, 12)
-        item = f"Magische Rüstung ({MAGIC_ARMOR_W12[r12]})"
-        extra_details.append(f"W12 Rüstung: {r12} -> {MAGIC_ARMOR_W12[r12]}")
+    item, sub = hit
+    if sub is None:
+        return r, item, []
 
-    return r, item, extra_details
+    name, label, options = sub
+    sub_roll = _roll_die(len(options))
+    picked = options[sub_roll - 1]
+    return r, f"{name} ({picked})", [f"{label}: {sub_roll} -> {picked}"]
 
 HOARD_COINS: Dict[str, List[Tuple[str, int, int, int]]] = {
     "0-4": [("KM", 6, 6, 100), ("SM", 3, 6, 100), ("GM", 2, 6, 10)],
@@ -1412,6 +1528,12 @@ HOARD_COINS: Dict[str, List[Tuple[str, int, int, int]]] = {
     "17+": [("GM", 12, 6, 1000), ("PM", 8, 6, 1000)],
 }
 
+# Hort -> (Würfelanzahl, Seiten), wenn alle Münzwürfe dieselben Würfel nutzen
+HOARD_COIN_DICE: Dict[str, Optional[Tuple[int, int]]] = {
+    k: (sum(c for _coin, c, _s, _m in v), v[0][2]) if len({s for _coin, _c, s, _m in v}) == 1 else None
+    for k, v in HOARD_COINS.items()
+}
+
 HOARD_LOOT: Dict[str, List[Tuple[int, int, Optional[Tuple[str, Tuple[int, int], int]], List[Tuple[str, str]]]]] = {
     "0-4": [
         (1, 30, ("gems", (2, 6), 10), []),
@@ -1443,6 +1565,11 @@ HOARD_LOOT: Dict[str, List[Tuple[int, int, Optional[Tuple[str, Tuple[int, int],
     ],
 }
 
+HOARD_LOOT_BOUNDS = {
+    cr: _range_table_bounds([(a, b, (gem_art, magic)) for a, b, gem_art, magic in table])
+    for cr, table in HOARD_LOOT.items()
+}
+
 def _cr_label(cr_key: str) -> str:
     if cr_key == "0-4":
         return "0 bis 4"
@@ -1470,41 +1597,49 @@ def build_treasure_cr_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(rows)
 
+TREASURE_KIND_KEYBOARD = build_treasure_kind_keyboard()
+TREASURE_CR_KEYBOARD = build_treasure_cr_keyboard()
+
+def _append_coin_lines(lines: List[str], totals: List[int]) -> None:
+    start = len(lines)
+    for coin, n in zip(COIN_ORDER, totals):
+        if n > 0:
+            lines.append(f"{coin}: {_fmt_int(n)}")
+    if len(lines) == start:
+        lines.append("Keine Münzen")
+
 def _roll_individual_treasure(cr_key: str) -> str:
-    w100 = random.randint(1, 100)
-    table = INDIVIDUAL_TREASURE[cr_key]
-    specs = _pick_range_table([(a, b, payload) for a, b, payload in table], w100) or []
-    totals: Dict[str, int] = {k: 0 for k in COIN_ORDER}
+    w100 = _roll_die(100)
+    specs = _pick_range_bounds(INDIVIDUAL_TREASURE_BOUNDS[cr_key], w100) or []
+    # Summen als Liste in COIN_ORDER Reihenfolge
+    totals = [0] * len(COIN_ORDER)
     details: List[str] = []
 
     for coin, c, s, m in specs:
         amount, det = _roll_coin_spec(coin, c, s, m)
-        totals[coin] += amount
+        totals[COIN_INDEX[coin]] += amount
         details.append(det)
 
-    lines = []
-    for coin in COIN_ORDER:
-        if totals.get(coin, 0) > 0:
-            lines.append(f"{coin}: {_fmt_int(totals[coin])}")
-    if not lines:
-        lines.append("Keine Münzen")
-
-    msg = (
-        f"💰 Rollschatz\n"
-        f"Art: Einzelschatz\n"
-        f"Herausforderungsgrad: {_cr_label(cr_key)}\n"
-        f"W100: {_fmt_w100(w100)}\n\n"
-        "Ergebnis:\n" + "\n".join(lines)
-    )
+    lines = [
+        "💰 Rollschatz",
+        "Art: Einzelschatz",
+        f"Herausforderungsgrad: {_cr_label(cr_key)}",
+        f"W100: {_fmt_w100(w100)}",
+        "",
+        "Ergebnis:",
+    ]
+    _append_coin_lines(lines, totals)
 
     if details:
-        msg += "\n\nWürfe:\n" + "\n".join(details)
+        lines.append("")
+        lines.append("Würfe:")
+        lines.extend(details)
 
-    return msg
+    return "\n".join(lines)
 
 def _roll_gem_or_art(spec: Tuple[str, Tuple[int, int], int]) -> Tuple[str, List[str]]:
     kind, (dc, ds), value_each = spec
-    count, rolls = _roll_nds(dc, ds)
+    count, rolls = _roll_sum(dc, ds)
     total_value = count * value_each
     kind_label = "Edelsteine" if kind == "gems" else "Kunstgegenstände"
     detail = f"{dc}W{ds} = {count} (Würfe: {', '.join(map(str, rolls))})"
@@ -1513,17 +1648,26 @@ def _roll_gem_or_art(spec: Tuple[str, Tuple[int, int], int]) -> Tuple[str, List[
 
 def _roll_hoard_treasure(cr_key: str) -> str:
     coin_specs = HOARD_COINS[cr_key]
-    coin_totals: Dict[str, int] = {k: 0 for k in COIN_ORDER}
+    coin_totals = [0] * len(COIN_ORDER)
     coin_details: List[str] = []
 
-    for coin, c, s, m in coin_specs:
-        amount, det = _roll_coin_spec(coin, c, s, m)
-        coin_totals[coin] += amount
-        coin_details.append(det)
+    batch = HOARD_COIN_DICE[cr_key]
+    if batch is not None:
+        pool = _roll_dice(batch[0], batch[1])
+        pos = 0
+        for coin, c, s, m in coin_specs:
+            amount, det = _coin_spec_result(coin, c, s, m, pool[pos:pos + c])
+            pos += c
+            coin_totals[COIN_INDEX[coin]] += amount
+            coin_details.append(det)
+    else:
+        for coin, c, s, m in coin_specs:
+            amount, det = _roll_coin_spec(coin, c, s, m)
+            coin_totals[COIN_INDEX[coin]] += amount
+            coin_details.append(det)
 
-    w100 = random.randint(1, 100)
-    loot_table = HOARD_LOOT.get(cr_key, [])
-    payload = _pick_range_table([(a, b, (gem_art, magic)) for a, b, gem_art, magic in loot_table], w100)
+    w100 = _roll_die(100)
+    payload = _pick_range_bounds(HOARD_LOOT_BOUNDS.get(cr_key, ((), ())), w100)
 
     if payload is None:
         gem_art = None
@@ -1531,16 +1675,9 @@ def _roll_hoard_treasure(cr_key: str) -> str:
     else:
         gem_art, magic_rolls = payload
 
-    lines = [f"💰 Rollschatz", f"Art: Schatzhort", f"Herausforderungsgrad: {_cr_label(cr_key)}", ""]
-    coin_lines = []
-    for coin in COIN_ORDER:
-        if coin_totals.get(coin, 0) > 0:
-            coin_lines.append(f"{coin}: {_fmt_int(coin_totals[coin])}")
-    if not coin_lines:
-        coin_lines.append("Keine Münzen")
-
+    lines = ["💰 Rollschatz", "Art: Schatzhort", f"Herausforderungsgrad: {_cr_label(cr_key)}", ""]
     lines.append("Münzen:")
-    lines.extend(coin_lines)
+    _append_coin_lines(lines, coin_totals)
     lines.append("")
     lines.append(f"W100: {_fmt_w100(w100)}")
 
@@ -1564,8 +1701,8 @@ def _roll_hoard_treasure(cr_key: str) -> str:
         for table_letter, count_expr in magic_rolls:
             n, n_detail = _roll_count_expr(count_expr)
             magic_details.append(f"Tabelle {table_letter}: {n_detail}")
-            for _ in range(max(0, n)):
-                r_item, item, extra = _pick_magic_item(table_letter)
+            for w100_item in _roll_dice(max(0, n), 100):
+                r_item, item, extra = _pick_magic_item(table_letter, w100_item)
                 magic_items.append(f"Tabelle {table_letter} W100 {_fmt_w100(r_item)}: {item}")
                 magic_details.extend(extra)
 
@@ -1574,26 +1711,23 @@ def _roll_hoard_treasure(cr_key: str) -> str:
         else:
             lines.append("Keine magischen Gegenstände")
 
-    out = "\n".join(lines)
-
-    all_details: List[str] = []
-    all_details.extend(coin_details)
-    if extra_details:
-        all_details.append("Zusatzzahlen:")
-        all_details.extend(extra_details)
-    if magic_details:
-        all_details.append("Magie Würfe:")
-        all_details.extend(magic_details)
-
-    if all_details:
-        out += "\n\nWürfe:\n" + "\n".join(all_details)
+    if coin_details or extra_details or magic_details:
+        lines.append("")
+        lines.append("Würfe:")
+        lines.extend(coin_details)
+        if extra_details:
+            lines.append("Zusatzzahlen:")
+            lines.extend(extra_details)
+        if magic_details:
+            lines.append("Magie Würfe:")
+            lines.extend(magic_details)
 
-    return out
+    return "\n".join(lines)
 
 async def rollschatz_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     context.user_data.pop("treasure_kind", None)
     context.user_data.pop("treasure_cr", None)
-    await update.message.reply_text("💰 Rollschatz\nWas willst du würfeln?", reply_markup=build_treasure_kind_keyboard())
+    await update.message.reply_text("💰 Rollschatz\nWas willst du würfeln?", reply_markup=TREASURE_KIND_KEYBOARD)
     return TREASURE_KIND_STATE
 
 async def rollschatz_pick_kind(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1605,7 +1739,7 @@ async def rollschatz_pick_kind(update: Update, context: ContextTypes.DEFAULT_TYP
         return ConversationHandler.END
 
     context.user_data["treasure_kind"] = kind
-    await query.edit_message_text("Welcher Herausforderungsgrad?", reply_markup=build_treasure_cr_keyboard())
+    await query.edit_message_text("Welcher Herausforderungsgrad?", reply_markup=TREASURE_CR_KEYBOARD)
     return TREASURE_CR_STATE
 
 async def rollschatz_pick_cr(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -1664,7 +1798,7 @@ DUNGEON_GOALS = [
     "Töte oder vertreibe den Anführer",
 ]
 
-ROOM_LAYOUT = [
+ROOM_LAYOUT = (
     "enger Korridor",
     "breite Halle",
     "runde Kammer",
@@ -1673,9 +1807,9 @@ ROOM_LAYOUT = [
     "Treppe in die Tiefe",
     "Brücke über eine Schlucht",
     "kleine Nische hinter Steinplatten",
-]
+)
 
-ROOM_MOOD = [
+ROOM_MOOD = (
     "flackerndes Licht und lange Schatten",
     "klamme Kälte, Atem wird sichtbar",
     "schwerer Staub, jeder Schritt knirscht",
@@ -1686,29 +1820,87 @@ ROOM_MOOD = [
     "unheimliche Stille, kein Echo",
     "dicke Spinnweben, alte Kokons",
     "frische Kratzspuren, hier ist etwas aktiv",
-]
+)
 
-ROOM_TYPE = [
+ROOM_TYPE = (
     "Kampf",
     "Falle",
     "Rätsel",
     "Entdeckung",
     "Soziales",
     "Schatz",
-]
+)
 
-COMPLICATION = [
+COMPLICATION = (
     "Zeitdruck, etwas nähert sich",
     "Alarmmechanismus, Fehler ruft Verstärkung",
     "Giftige Luft, langes Verweilen kostet Ausdauer",
     "Magischer Nebel, Sicht ist stark eingeschränkt",
     "Der Boden ist instabil, Gefahr einzustürzen",
     "Ein Fluch liegt auf dem Raum, kurze Nebenwirkung",
-]
+)
+
+DUNGEON_ENCOUNTER_STYLES = (
+    "Schwarm kleiner Gegner",
+    "ein Elite Gegner mit Support",
+    "Hinterhalt aus Deckung",
+    "Patrouille, die Verstärkung rufen kann",
+    "Mini Boss mit Terrain Vorteil",
+    "zwei Fraktionen, die sich gerade bekämpfen",
+)
+
+DUNGEON_TRAPS = (
+    "Druckplatte löst Pfeilsalve aus",
+    "Fallgrube mit Stacheln",
+    "Schwingende Klinge aus der Wand",
+    "Runensiegel, das Blitzschaden entlädt",
+    "Gasfalle, die Sicht und Atmung stört",
+    "Einsturz, wenn zu viel Gewicht drauf kommt",
+)
+
+DUNGEON_PUZZLES = (
+    "Drehbare Statuen, die in die richtige Richtung zeigen müssen",
+    "Runenreihenfolge, die den Raum entsperrt",
+    "Gewichtsrätsel mit vier Sockeln",
+    "Lichtstrahlen über Spiegel umleiten",
+    "Zahlenmuster, das eine Tür entriegelt",
+    "Rätselspruch auf einer Säule, Antwort öffnet einen Mechanismus",
+)
+
+DUNGEON_DISCOVERIES = (
+    "alte Karte mit Abkürzung",
+    "Tagebuch mit Hinweis auf den Boss",
+    "geheime Hebelwand, die einen Raum überspringt",
+    "Ritualkreis, der kurz einen Buff gibt",
+    "Wandrelief mit Lore und Warnung",
+    "Spuren, die zeigen, wo die Beute gelagert ist",
+)
+
+DUNGEON_NPCS = (
+    "verletzter Kundschafter, der raus will",
+    "Gefangener, der einen Deal anbietet",
+    "unsicherer Kultist, der zweifelt",
+    "geistiger Wächter, der Fragen stellt",
+    "kleines Monster, das handeln will",
+    "Söldnertrupp, der auch hier ist",
+)
+
+DUNGEON_LOOT = (
+    "versteckte Truhe hinter losen Steinen",
+    "Opfergabe auf einem Altar",
+    "Gürteltasche an einem Skelett",
+    "Kiste mit Siegel, das erst geknackt werden muss",
+    "Schmugglersafe in der Wand",
+    "magisch versiegeltes Kästchen",
+)
+
+_DUNGEON_THEMES_HTML = tuple(html.escape(t, quote=False) for t in DUNGEON_THEMES)
+_DUNGEON_GOALS_HTML = tuple(html.escape(g, quote=False) for g in DUNGEON_GOALS)
 
 def _tg_spoiler(text: str) -> str:
-    return f"<tg-spoiler>{html.escape(text)}</tg-spoiler>"
+    return "<tg-spoiler>" + html.escape(text, quote=False) + "</tg-spoiler>"
 
+@lru_cache(maxsize=64)
 def _dungeon_dc(level: int, hard: bool = False) -> int:
     base = 10 + (level // 3)
     if hard:
@@ -1718,121 +1910,87 @@ def _dungeon_dc(level: int, hard: bool = False) -> int:
 def _room_count(level: int, players: int) -> int:
     base = 2 + math.ceil(level / 4)
     party_adj = round((players - 3) / 2)
-    n = base + party_adj + random.randint(0, 3)
+    n = base + party_adj + _RNG.randint(0, 3)
     return clamp(n, 3, 12)
 
-def _pick_encounter_style(level: int, players: int) -> str:
-    styles = [
-        "Schwarm kleiner Gegner",
-        "ein Elite Gegner mit Support",
-        "Hinterhalt aus Deckung",
-        "Patrouille, die Verstärkung rufen kann",
-        "Mini Boss mit Terrain Vorteil",
-        "zwei Fraktionen, die sich gerade bekämpfen",
-    ]
-    hint = "leichter" if level <= 4 else "normal"
-    if level >= 11:
-        hint = "hart"
-    if players <= 2:
-        hint = "eher kleiner"
+@lru_cache(maxsize=128)
+def _encounter_scale_suffix(level: int, players: int) -> str:
+    # Gruppengröße geht vor Stufe
     if players >= 5:
         hint = "eher größer"
-    return f"{random.choice(styles)} (Skalierung: {hint})"
-
-def _pick_trap(level: int) -> str:
-    traps = [
-        "Druckplatte löst Pfeilsalve aus",
-        "Fallgrube mit Stacheln",
-        "Schwingende Klinge aus der Wand",
-        "Runensiegel, das Blitzschaden entlädt",
-        "Gasfalle, die Sicht und Atmung stört",
-        "Einsturz, wenn zu viel Gewicht drauf kommt",
-    ]
-    dc = _dungeon_dc(level, hard=False)
-    return f"{random.choice(traps)} (SG {dc} entdecken oder entschärfen)"
-
-def _pick_puzzle(level: int) -> str:
-    puzzles = [
-        "Drehbare Statuen, die in die richtige Richtung zeigen müssen",
-        "Runenreihenfolge, die den Raum entsperrt",
-        "Gewichtsrätsel mit vier Sockeln",
-        "Lichtstrahlen über Spiegel umleiten",
-        "Zahlenmuster, das eine Tür entriegelt",
-        "Rätselspruch auf einer Säule, Antwort öffnet einen Mechanismus",
-    ]
-    dc = _dungeon_dc(level, hard=True)
-    return f"{random.choice(puzzles)} (SG {dc} für Analyse oder Werkzeug)"
-
-def _pick_discovery(level: int) -> str:
-    finds = [
-        "alte Karte mit Abkürzung",
-        "Tagebuch mit Hinweis auf den Boss",
-        "geheime Hebelwand, die einen Raum überspringt",
-        "Ritualkreis, der kurz einen Buff gibt",
-        "Wandrelief mit Lore und Warnung",
-        "Spuren, die zeigen, wo die Beute gelagert ist",
-    ]
-    dc = _dungeon_dc(level, hard=False)
-    return f"{random.choice(finds)} (SG {dc} Wahrnehmung oder Investigation)"
-
-def _pick_social(level: int) -> str:
-    npcs = [
-        "verletzter Kundschafter, der raus will",
-        "Gefangener, der einen Deal anbietet",
-        "unsicherer Kultist, der zweifelt",
-        "geistiger Wächter, der Fragen stellt",
-        "kleines Monster, das handeln will",
-        "Söldnertrupp, der auch hier ist",
-    ]
-    dc = _dungeon_dc(level, hard=False)
-    return f"{random.choice(npcs)} (SG {dc} Überreden oder Einschüchtern, wenn nötig)"
-
-def _pick_treasure(level: int) -> str:
-    loot = [
-        "versteckte Truhe hinter losen Steinen",
-        "Opfergabe auf einem Altar",
-        "Gürteltasche an einem Skelett",
-        "Kiste mit Siegel, das erst geknackt werden muss",
-        "Schmugglersafe in der Wand",
-        "magisch versiegeltes Kästchen",
-    ]
-    dc = _dungeon_dc(level, hard=False)
-    return f"{random.choice(loot)} (Tipp: /rollschatz passend zum HG)"
-
-def _generate_room(i: int, n: int, level: int, players: int) -> str:
-    layout = random.choice(ROOM_LAYOUT)
-    mood = random.choice(ROOM_MOOD)
-    rtype = random.choice(ROOM_TYPE)
-    comp = random.choice(COMPLICATION)
-
-    if i == n:
-        rtype = "Finale"
-
-    title = f"Raum {i} von {n}"
-    header = f"{title}\nLayout: {layout}\nStimmung: {mood}"
-
-    if rtype == "Kampf":
-        body = f"Inhalt: Kampf\nBegegnung: {_pick_encounter_style(level, players)}\nKomplikation: {comp}"
-    elif rtype == "Falle":
-        body = f"Inhalt: Falle\nFalle: {_pick_trap(level)}\nKomplikation: {comp}"
-    elif rtype == "Rätsel":
-        body = f"Inhalt: Rätsel\nRätsel: {_pick_puzzle(level)}\nKomplikation: {comp}"
-    elif rtype == "Entdeckung":
-        body = f"Inhalt: Entdeckung\nFund: {_pick_discovery(level)}\nKomplikation: {comp}"
-    elif rtype == "Soziales":
-        body = f"Inhalt: Soziales\nNSC: {_pick_social(level)}\nKomplikation: {comp}"
-    elif rtype == "Schatz":
-        body = f"Inhalt: Schatz\nBeute: {_pick_treasure(level)}\nKomplikation: {comp}"
+    elif players <= 2:
+        hint = "eher kleiner"
+    elif level >= 11:
+        hint = "hart"
+    elif level <= 4:
+        hint = "leichter"
     else:
-        boss = _pick_encounter_style(level + 3, players)
-        body = (
-            "Inhalt: Finale\n"
-            f"Boss Szene: {boss}\n"
-            "Belohnung: Kreaturenhort oder Schlüssel zum Ziel\n"
-            "Tipp: Wenn du Loot willst, nimm /rollschatz als Schatzhort"
-        )
+        hint = "normal"
+    return f" (Skalierung: {hint})"
 
-    return header + "\n" + body
+def _pick_encounter_style(level: int, players: int) -> str:
+    return _choice(DUNGEON_ENCOUNTER_STYLES) + _encounter_scale_suffix(level, players)
+
+def _room_kampf(level: int, players: int, comp: str) -> List[str]:
+    return ["Inhalt: Kampf", f"Begegnung: {_pick_encounter_style(level, players)}", f"Komplikation: {comp}"]
+
+def _room_falle(level: int, players: int, comp: str) -> List[str]:
+    trap = _choice(DUNGEON_TRAPS)
+    return ["Inhalt: Falle", f"Falle: {trap} (SG {_dungeon_dc(level, False)} entdecken oder entschärfen)", f"Komplikation: {comp}"]
+
+def _room_raetsel(level: int, players: int, comp: str) -> List[str]:
+    puzzle = _choice(DUNGEON_PUZZLES)
+    return ["Inhalt: Rätsel", f"Rätsel: {puzzle} (SG {_dungeon_dc(level, True)} für Analyse oder Werkzeug)", f"Komplikation: {comp}"]
+
+def _room_entdeckung(level: int, players: int, comp: str) -> List[str]:
+    find = _choice(DUNGEON_DISCOVERIES)
+    return ["Inhalt: Entdeckung", f"Fund: {find} (SG {_dungeon_dc(level, False)} Wahrnehmung oder Investigation)", f"Komplikation: {comp}"]
+
+def _room_soziales(level: int, players: int, comp: str) -> List[str]:
+    npc = _choice(DUNGEON_NPCS)
+    return ["Inhalt: Soziales", f"NSC: {npc} (SG {_dungeon_dc(level, False)} Überreden oder Einschüchtern, wenn nötig)", f"Komplikation: {comp}"]
+
+def _room_schatz(level: int, players: int, comp: str) -> List[str]:
+    loot = _choice(DUNGEON_LOOT)
+    return ["Inhalt: Schatz", f"Beute: {loot} (Tipp: /rollschatz passend zum HG)", f"Komplikation: {comp}"]
+
+def _room_finale(level: int, players: int, comp: str) -> List[str]:
+    boss = _pick_encounter_style(level + 3, players)
+    return [
+        "Inhalt: Finale",
+        f"Boss Szene: {boss}",
+        "Belohnung: Kreaturenhort oder Schlüssel zum Ziel",
+        "Tipp: Wenn du Loot willst, nimm /rollschatz als Schatzhort",
+    ]
+
+# Reihenfolge wie ROOM_TYPE
+ROOM_FORMATTERS = (
+    _room_kampf,
+    _room_falle,
+    _room_raetsel,
+    _room_entdeckung,
+    _room_soziales,
+    _room_schatz,
+)
+
+# Layout, Stimmung, Raumtyp und Komplikation stecken zusammen in einer Zahl
+_ROOM_STATE_SPACE = len(ROOM_LAYOUT) * len(ROOM_MOOD) * len(ROOM_TYPE) * len(COMPLICATION)
+
+def _roll_room_state() -> Tuple[str, str, int, str]:
+    r, layout_idx = divmod(_RNG.randrange(_ROOM_STATE_SPACE), len(ROOM_LAYOUT))
+    r, mood_idx = divmod(r, len(ROOM_MOOD))
+    comp_idx, rtype_idx = divmod(r, len(ROOM_TYPE))
+    return ROOM_LAYOUT[layout_idx], ROOM_MOOD[mood_idx], rtype_idx, COMPLICATION[comp_idx]
+
+def _generate_room(
+    i: int, n: int, level: int, players: int,
+    layout: str, mood: str, rtype_idx: int, comp: str,
+) -> str:
+    formatter = _room_finale if i == n else ROOM_FORMATTERS[rtype_idx]
+
+    parts: List[str] = [f"Raum {i} von {n}", f"Layout: {layout}", f"Stimmung: {mood}"]
+    parts += formatter(level, players, comp)
+    return "\n".join(parts)
 
 def build_dungeon_level_keyboard() -> InlineKeyboardMarkup:
     rows: List[List[InlineKeyboardButton]] = []
@@ -1852,45 +2010,51 @@ def build_dungeon_players_keyboard() -> InlineKeyboardMarkup:
     rows.append([InlineKeyboardButton("Abbrechen", callback_data="dungeon_cancel")])
     return InlineKeyboardMarkup(rows)
 
-async def rolldungeon_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    context.user_data.pop("dungeon_level", None)
-    context.user_data.pop("dungeon_players", None)
+DUNGEON_LEVEL_KEYBOARD = build_dungeon_level_keyboard()
+DUNGEON_PLAYERS_KEYBOARD = build_dungeon_players_keyboard()
 
-    if len(context.args) >= 2:
-        try:
-            lvl = int(context.args[0])
-            ply = int(context.args[1])
-            if not (1 <= lvl <= 20 and 1 <= ply <= 6):
-                raise ValueError
+async def rolldungeon_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    args = context.args
+    if len(args) >= 2 and _INT_ARG.fullmatch(args[0]) and _INT_ARG.fullmatch(args[1]):
+        lvl = int(args[0])
+        ply = int(args[1])
+        if 1 <= lvl <= 20 and 1 <= ply <= 6:
             text = _build_dungeon_output(lvl, ply)
             await update.message.reply_text(text, parse_mode="HTML", disable_web_page_preview=True)
             return ConversationHandler.END
-        except Exception:
-            pass
 
-    await update.message.reply_text("🏰 Rolldungeon\nWähle das Spielerlevel:", reply_markup=build_dungeon_level_keyboard())
+    context.user_data.pop("dungeon_level", None)
+    context.user_data.pop("dungeon_players", None)
+    await update.message.reply_text("🏰 Rolldungeon\nWähle das Spielerlevel:", reply_markup=DUNGEON_LEVEL_KEYBOARD)
     return DUNGEON_PICK_LEVEL
 
+_DUNGEON_HEADER_TMPL = (
+    "🏰 <b>Rolldungeon</b>\n"
+    "Level: <b>%d</b> | Spieler: <b>%d</b> | Räume: <b>%d</b>\n"
+    "Tipp: Wenn du per Hand spoilern willst: STRG+SHIFT+P pro Raum\n"
+    "Thema: <b>%s</b>\n"
+    "Ziel: <b>%s</b>\n\n"
+    "Alle Räume sind Spoiler. Antippen zum Aufdecken.\n"
+)
+
 def _build_dungeon_output(level: int, players: int) -> str:
-    theme = random.choice(DUNGEON_THEMES)
-    goal = random.choice(DUNGEON_GOALS)
+    theme = _choice(_DUNGEON_THEMES_HTML)
+    goal = _choice(_DUNGEON_GOALS_HTML)
     n = _room_count(level, players)
 
-    header = (
-        "🏰 <b>Rolldungeon</b>\n"
-        f"Level: <b>{level}</b> | Spieler: <b>{players}</b> | Räume: <b>{n}</b>\n"
-        "Tipp: Wenn du per Hand spoilern willst: STRG+SHIFT+P pro Raum\n"
-        f"Thema: <b>{html.escape(theme)}</b>\n"
-        f"Ziel: <b>{html.escape(goal)}</b>\n\n"
-        "Alle Räume sind Spoiler. Antippen zum Aufdecken.\n"
-    )
+    header = _DUNGEON_HEADER_TMPL % (level, players, n, theme, goal)
 
-    rooms = []
+    buf = io.StringIO()
+    buf.write(header)
     for i in range(1, n + 1):
-        room_txt = _generate_room(i, n, level, players)
-        rooms.append(_tg_spoiler(room_txt))
+        layout, mood, rtype_idx, comp = _roll_room_state()
+        room_txt = _generate_room(i, n, level, players, layout, mood, rtype_idx, comp)
+        if i > 1:
+            buf.write("\n\n")
+        buf.write(_tg_spoiler(room_txt))
+    buf.write("\n\nViel Spaß 😊")
 
-    return header + "\n\n".join(rooms) + "\n\nViel Spaß 😊"
+    return buf.getvalue()
 
 async def rolldungeon_pick_level(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
@@ -1899,7 +2063,7 @@ async def rolldungeon_pick_level(update: Update, context: ContextTypes.DEFAULT_T
     lvl = int(query.data.split(":", 1)[1])
     context.user_data["dungeon_level"] = lvl
 
-    await query.edit_message_text("Wie viele Spieler?", reply_markup=build_dungeon_players_keyboard())
+    await query.edit_message_text("Wie viele Spieler?", reply_markup=DUNGEON_PLAYERS_KEYBOARD)
     return DUNGEON_PICK_PLAYERS
 
 async def rolldungeon_pick_players(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -2062,7 +2226,7 @@ HP_WILL_MOD = {
 
 
 def _roll_2d6() -> Tuple[int, List[int]]:
-    dice = [random.randint(1, 6), random.randint(1, 6)]
+    dice = _roll_dice(2, 6)
     return sum(dice), dice
 
 
@@ -2093,12 +2257,14 @@ def _display_choice(value: str) -> str:
     return canonical.capitalize()
 
 
+_CHOICE_NUMBER = re.compile(r"^(\d+)")
+
 def _parse_choice_from_pairs(text_value: str, choices: List[Tuple[str, str]]) -> Optional[str]:
     raw = (text_value or "").strip().lower()
     values = [value for _, value in choices]
     if raw in values:
         return raw
-    nr = re.match(r"^(\d+)", raw)
+    nr = _CHOICE_NUMBER.match(raw)
     if nr:
         idx = int(nr.group(1)) - 1
         if 0 <= idx < len(choices):
@@ -2124,6 +2290,8 @@ def _build_reaction_keyboard(step: int) -> InlineKeyboardMarkup:
     rows.append([InlineKeyboardButton("Abbrechen", callback_data="reaktion_cancel")])
     return InlineKeyboardMarkup(rows)
 
+REACTION_KEYBOARDS = {step: _build_reaction_keyboard(step) for step in REACTION_CHOICES_BY_STATE}
+
 
 def _reaction_prompt(step: int) -> str:
     return (
@@ -2137,7 +2305,7 @@ async def _send_reaction_prompt(update: Update, step: int, prefix: Optional[str]
     text = _reaction_prompt(step)
     if prefix:
         text = f"{prefix}\n\n{text}"
-    reply_markup = _build_reaction_keyboard(step)
+    reply_markup = REACTION_KEYBOARDS[step]
 
     if update.callback_query:
         await update.callback_query.edit_message_text(text, reply_markup=reply_markup)
@@ -2145,27 +2313,40 @@ async def _send_reaction_prompt(update: Update, step: int, prefix: Optional[str]
         await update.message.reply_text(text, reply_markup=reply_markup)
 
 
+# W10 bei 1–10% HP, Index = Wurf - 1
+_LOW_HP_W10_WILD = ("Flucht",) * 8 + ("Defensive Gegenwehr",) + ("Bleibt im Kampf",)
+LOW_HP_W10_BY_NATURE: Dict[str, Tuple[str, ...]] = {
+    "friedlich": _LOW_HP_W10_WILD,
+    "neutral": _LOW_HP_W10_WILD,
+    "territorial": _LOW_HP_W10_WILD,
+    "räuberisch": _LOW_HP_W10_WILD,
+    "kompromissbereit": ("Flucht",) * 5 + ("Aufgabe / Verhandlung",) * 3 + ("Kämpft weiter",) * 2,
+}
+LOW_HP_W10_DEFAULT = ("Flucht",) * 4 + ("Rückzug mit Gegenwehr",) * 2 + ("Kämpft weiter",) * 4
+
+# Obergrenzen der Bereiche für bisect, darüber gilt der letzte Eintrag
+CONTACT_UPPERS = (4, 7, 10, 13)
+CONTACT_RESULTS = (
+    "Angriff",
+    "Drohen / Vertreiben",
+    "Beobachten / Abwarten",
+    "Reden / Deal möglich",
+    "Freundlich / lässt passieren / zieht ab",
+)
+MORALE_UPPERS = (2, 5, 8)
+MORALE_RESULTS = (
+    "Panik, Flucht oder Aufgabe",
+    "Rückzug / Verhandlung",
+    "Kämpft defensiv weiter",
+    "Kämpft voll weiter",
+)
+
 def _special_low_hp_result(nature: str, discipline: str) -> Tuple[str, int]:
     if discipline in ("fanatisch", "geistlos"):
         return ("Kämpft weiter (Sonderregel für Fanatiker/Untote/Konstrukte)", 10)
-    roll = random.randint(1, 10)
-    if nature in ("friedlich", "neutral", "territorial", "räuberisch"):
-        if roll <= 8:
-            return (f"Flucht (W10={roll})", roll)
-        if roll == 9:
-            return (f"Defensive Gegenwehr (W10={roll})", roll)
-        return (f"Bleibt im Kampf (W10={roll})", roll)
-    if nature in ("kompromissbereit",):
-        if roll <= 5:
-            return (f"Flucht (W10={roll})", roll)
-        if roll <= 8:
-            return (f"Aufgabe / Verhandlung (W10={roll})", roll)
-        return (f"Kämpft weiter (W10={roll})", roll)
-    if roll <= 4:
-        return (f"Flucht (W10={roll})", roll)
-    if roll <= 6:
-        return (f"Rückzug mit Gegenwehr (W10={roll})", roll)
-    return (f"Kämpft weiter (W10={roll})", roll)
+    roll = _roll_die(10)
+    outcome = LOW_HP_W10_BY_NATURE.get(nature, LOW_HP_W10_DEFAULT)[roll - 1]
+    return (f"{outcome} (W10={roll})", roll)
 
 
 def generate_reaction_report(data: Dict[str, str]) -> str:
@@ -2185,16 +2366,7 @@ def generate_reaction_report(data: Dict[str, str]) -> str:
     )
     contact_score = contact_total + contact_mod
 
-    if contact_score <= 4:
-        contact_result = "Angriff"
-    elif contact_score <= 7:
-        contact_result = "Drohen / Vertreiben"
-    elif contact_score <= 10:
-        contact_result = "Beobachten / Abwarten"
-    elif contact_score <= 13:
-        contact_result = "Reden / Deal möglich"
-    else:
-        contact_result = "Freundlich / lässt passieren / zieht ab"
+    contact_result = CONTACT_RESULTS[bisect.bisect_left(CONTACT_UPPERS, contact_score)]
 
     will_base = DISCIPLINE_WILL.get(discipline, 4)
     will_mod = (
@@ -2212,14 +2384,8 @@ def generate_reaction_report(data: Dict[str, str]) -> str:
 
     if special_low_hp_line:
         morale_result = special_low_hp_line
-    elif will_score <= 2:
-        morale_result = "Panik, Flucht oder Aufgabe"
-    elif will_score <= 5:
-        morale_result = "Rückzug / Verhandlung"
-    elif will_score <= 8:
-        morale_result = "Kämpft defensiv weiter"
     else:
-        morale_result = "Kämpft voll weiter"
+        morale_result = MORALE_RESULTS[bisect.bisect_left(MORALE_UPPERS, will_score)]
 
     lines = [
         "👁️ Reaktions- und Moralwurf",
@@ -2374,30 +2540,31 @@ async def ping(request):
 # HELP
 # -----------------------
 
+HELP_MSG = (
+    "🧰 Befehle\n\n"
+    "/help  diese Hilfe\n"
+    "/roll <Ausdruck>  Würfeln, z.B. /roll 1d6 oder /roll 2d20+3 oder /roll 1d20+2d6+3 (auch 1w6)\n"
+    "/rollchance  Skillwurf plus SG und Belohnung\n"
+    "/reaktion  fragt 6 Punkte ab und gibt Erstkontakt + Kampf-Moral aus\n"
+    "/rollhunt  Jagdwurf mit Mod Auswahl\n"
+    "/rollwaldkarte  zieht eine Waldkarte (Skillchance, Ruhe, Entdeckung, Encounter, Hort, NPC)\n"
+    "/rolldungeon  Dungeon Generator mit Spoiler Räumen\n"
+    "/rollplayerbehaviour  würfelt Rollplayer Behaviour (1W6)\n"
+    "/rollschatz  würfelt Schatz (Schatzhort oder Einzelschatz) nach Herausforderungsgrad\n\n"
+    "🌍 Biom\n"
+    "/setbiom <Biom>  setzt dein aktuelles Biom (oder ohne Parameter per Buttons)\n"
+    "/biom  zeigt dein aktuelles Biom\n"
+    "/rollbiom [Biom]  würfelt das nächste Biom (optional vorher setzen)\n\n"
+    "⚔️ Encounters\n"
+    "/rollencounter [Biom]  würfelt einen Encounter (nutzt sonst dein aktuelles Biom)\n"
+    "/encdebug  zeigt welche Encounter Tabellen wirklich geladen wurden\n\n"
+    "🔮 Orakel\n"
+    "/rolloracle [Frage]  Ja Nein Orakel\n"
+    "/cancel  bricht Orakel, Encounter, Schatz oder Rolldungeon Auswahl ab"
+)
+
 async def help_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    msg = (
-        "🧰 Befehle\n\n"
-        "/help  diese Hilfe\n"
-        "/roll <Ausdruck>  Würfeln, z.B. /roll 1d6 oder /roll 2d20+3 oder /roll 1d20+2d6+3 (auch 1w6)\n"
-        "/rollchance  Skillwurf plus SG und Belohnung\n"
-        "/reaktion  fragt 6 Punkte ab und gibt Erstkontakt + Kampf-Moral aus\n"
-        "/rollhunt  Jagdwurf mit Mod Auswahl\n"
-        "/rollwaldkarte  zieht eine Waldkarte (Skillchance, Ruhe, Entdeckung, Encounter, Hort, NPC)\n"
-        "/rolldungeon  Dungeon Generator mit Spoiler Räumen\n"
-        "/rollplayerbehaviour  würfelt Rollplayer Behaviour (1W6)\n"
-        "/rollschatz  würfelt Schatz (Schatzhort oder Einzelschatz) nach Herausforderungsgrad\n\n"
-        "🌍 Biom\n"
-        "/setbiom <Biom>  setzt dein aktuelles Biom (oder ohne Parameter per Buttons)\n"
-        "/biom  zeigt dein aktuelles Biom\n"
-        "/rollbiom [Biom]  würfelt das nächste Biom (optional vorher setzen)\n\n"
-        "⚔️ Encounters\n"
-        "/rollencounter [Biom]  würfelt einen Encounter (nutzt sonst dein aktuelles Biom)\n"
-        "/encdebug  zeigt welche Encounter Tabellen wirklich geladen wurden\n\n"
-        "🔮 Orakel\n"
-        "/rolloracle [Frage]  Ja Nein Orakel\n"
-        "/cancel  bricht Orakel, Encounter, Schatz oder Rolldungeon Auswahl ab"
-    )
-    await update.message.reply_text(msg)
+    await update.message.reply_text(HELP_MSG)
 
 def main():
     token = os.environ.get("TELEGRAM_BOT_TOKEN")